@@ -0,0 +1,94 @@
+from pathlib import Path
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+
+
+class HtmlArchive:
+    """
+    Compressed, content-addressed store of fetched profile pages, so the
+    extractors can be re-run offline after a markup change or a new field.
+    Each page is gzipped under objects/ by the SHA-256 of its HTML, identical
+    pages are stored once, and an append-only index.ndjson maps URLs to them.
+    Safe to share between the pool's threads.
+    """
+    def __init__(self, root):
+        """
+        Args:
+            root (str): Archive directory, created if missing
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / 'index.ndjson'
+        self.lock = threading.Lock()
+        self.index = None
+        self.stored = 0
+        self.deduplicated = 0
+
+    def put(self, url, html):
+        """
+        Archives the HTML of a page.
+
+        Returns:
+            str: Digest the page is stored under
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        exists = path.exists()
+        if not exists:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(gzip.compress(data, compresslevel=6))
+            os.replace(tmp_path, path)
+
+        record = json.dumps({'url': url, 'digest': digest, 'fetched_at': time.time()})
+        with self.lock:
+            if exists:
+                self.deduplicated += 1
+            else:
+                self.stored += 1
+            if self.index is None:
+                self.index = open(self.index_path, 'a')
+            self.index.write(record + '\n')
+            self.index.flush()
+        return digest
+
+    def get(self, digest):
+        """Returns the archived HTML stored under a digest."""
+        return gzip.decompress(self._object_path(digest).read_bytes()).decode('utf-8')
+
+    def entries(self):
+        """
+        Returns:
+            dict: URL -> digest of its latest archived version, in first-archived order
+        """
+        latest = {}
+        if not self.index_path.exists():
+            return latest
+        with open(self.index_path) as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Ignoring corrupt archive index line {line_number} in {self.index_path}")
+                    continue
+                latest[record['url']] = record['digest']
+        return latest
+
+    def summary(self):
+        return f"HTML archive: {self.stored} pages stored, {self.deduplicated} unchanged pages deduplicated"
+
+    def close(self):
+        with self.lock:
+            if self.index:
+                self.index.close()
+                self.index = None
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest[2:]}.html.gz"
@@ -0,0 +1,217 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+import logging
+from snapshot import PageSnapshot
+from http_fetch import HttpFetcher, FETCH_CHALLENGE
+
+
+class AsyncHttpFetcher:
+    """
+    Async fetch layer over the pooled keep-alive session of an HttpFetcher.
+    Requests run on a thread pool as wide as the concurrency limit, cookie
+    syncs run on the driver's own thread so the driver is never shared.
+    """
+    def __init__(self, http_fetcher, concurrency, driver_executor):
+        """
+        Args:
+            http_fetcher (HttpFetcher): Fetcher whose session and driver cookies are used
+            concurrency (int): Requests in flight at most
+            driver_executor (Executor): Single thread owning the Chrome driver
+        """
+        self.http_fetcher = http_fetcher
+        self.driver_executor = driver_executor
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='fetch')
+        self.sync_lock = asyncio.Lock()
+
+    async def fetch(self, url, marker):
+        """
+        Fetches a page over HTTP.
+
+        Args:
+            url (str): URL to fetch
+            marker (str): Text that must appear in a usable page
+
+        Returns:
+            tuple: (page HTML, or None if the browser should be used instead,
+                failure as returned by HttpFetcher.fetch_page)
+        """
+        loop = asyncio.get_running_loop()
+        if not self.http_fetcher.synced:
+            async with self.sync_lock:
+                if not self.http_fetcher.synced:
+                    try:
+                        await loop.run_in_executor(self.driver_executor, self.http_fetcher.sync_from_driver)
+                    except Exception as e:
+                        logging.debug(f"Could not sync cookies from the driver: {e}")
+        return await loop.run_in_executor(
+            self.executor, lambda: self.http_fetcher.fetch_page(url, marker, sync=False)
+        )
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class AsyncEngine:
+    """
+    Runs the search-page and profile fetches of a crawl as asyncio tasks,
+    at most async_concurrency in flight and paced by the shared rate
+    controller. Pages and profiles the fetch layer cannot serve fall back
+    to the browser, on the pool when there is one.
+    """
+    def __init__(self, page_scraper, profile_scraper, extractor, pool, config, fetch_stats=None, fetcher=None,
+                 lookup_profile=None, record_profile=None, filter_profiles=None, defer_failure=None):
+        """
+        Args:
+            page_scraper: PageScraper of the main driver, used for search page fallbacks
+            profile_scraper: ProfileScraper of the main driver, used for profile fallbacks without a pool
+            extractor: ProfileScraper without a driver, parsing fetched profiles on the event loop
+            pool: Optional started BrowserPool used for profile fallbacks
+            config: ScraperConfig instance
+            fetch_stats (FetchStats): Optional counters shared with the other HTTP fetchers
+            fetcher: Optional fetch layer with a coroutine fetch(url, marker) returning (HTML or None,
+                failure) like AsyncHttpFetcher, and a close() method; defaults to an AsyncHttpFetcher
+                using the main driver's cookies
+            lookup_profile (callable): Optional, returns known data for a URL instead of scraping it
+            record_profile (callable): Optional, called with (url, data) for each scraped profile
+            filter_profiles (callable): Optional, narrows each page's profile URLs before scraping
+            defer_failure (callable): Optional, called with (error, page, profile_url=None, elapsed=None)
+                for each failed page or profile instead of logging it
+        """
+        self.page_scraper = page_scraper
+        self.profile_scraper = profile_scraper
+        self.extractor = extractor
+        self.pool = pool
+        self.config = config
+        self.fetch_stats = fetch_stats
+        self.fetcher = fetcher
+        self.lookup_profile = lookup_profile or (lambda url: None)
+        self.record_profile = record_profile or (lambda url, data: None)
+        self.filter_profiles = filter_profiles or (lambda urls: urls)
+        self.defer_failure = defer_failure or self._log_failure
+        self.rate_controller = page_scraper.rate_controller
+        self.metrics = page_scraper.metrics
+        self.semaphore = None
+        self.driver_executor = None
+
+    async def run(self, base_url, pages, on_page_complete):
+        """
+        Scrapes every page and its profiles concurrently.
+
+        Args:
+            base_url (str): The base URL of the search
+            pages (list[int]): Page numbers to scrape
+            on_page_complete (callable): Called with (page_results, page_number) as each page completes
+        """
+        self.semaphore = asyncio.Semaphore(self.config.async_concurrency)
+        self.driver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='driver')
+        fetcher = self.fetcher or AsyncHttpFetcher(
+            HttpFetcher(
+                self.profile_scraper.driver, self.config, self.fetch_stats,
+                pool_size=self.config.async_concurrency
+            ),
+            self.config.async_concurrency,
+            self.driver_executor
+        )
+        # Links of each page known (or the page skipped); a page is only fetched once those
+        # of the first page, which tells how many pages there are, and of the page
+        # prefetch_pages before it are, so fetches stop soon after the last result
+        self.links_known = [asyncio.Event() for _ in pages]
+        try:
+            await asyncio.gather(*(
+                self._scrape_page(fetcher, base_url, index, page, on_page_complete)
+                for index, page in enumerate(pages)
+            ))
+        finally:
+            fetcher.close()
+            self.driver_executor.shutdown(wait=True)
+
+    async def _scrape_page(self, fetcher, base_url, index, page, on_page_complete):
+        lookahead = max(1, self.config.prefetch_pages)
+        try:
+            if index:
+                await self.links_known[0].wait()
+            if index >= lookahead:
+                await self.links_known[index - lookahead].wait()
+            if not self.page_scraper.wants_page(page):
+                return
+            logging.info(f"[INFO] Scraping page {page}")
+            profile_urls = await self._profile_links(fetcher, base_url, page)
+        except Exception as e:
+            self.defer_failure(e, page)
+            return
+        finally:
+            self.links_known[index].set()
+        
+        try:
+            profile_urls = self.filter_profiles(profile_urls)
+            results = await asyncio.gather(*(
+                self._scrape_profile(fetcher, profile_url, page) for profile_url in profile_urls
+            ))
+            page_results = [profile_data for profile_data in results if profile_data is not None]
+            if on_page_complete and page_results:
+                on_page_complete(page_results, page)
+        except Exception as e:
+            logging.error(f"Error scraping page {page}: {e}")
+
+    async def _profile_links(self, fetcher, base_url, page):
+        url = f"{base_url}&page={page}"
+        html = await self._fetch(fetcher, url, 'profiles-list')
+        if html is not None:
+            profile_urls = self.page_scraper.parse_profile_links(PageSnapshot(html), url, page)
+            if profile_urls:
+                return profile_urls
+        self.metrics.increment('http_fast_path_fallbacks')
+        return await self._in_driver(self.page_scraper.extract_profile_links, base_url, page)
+
+    async def _scrape_profile(self, fetcher, profile_url, page):
+        known_data = self.lookup_profile(profile_url)
+        if known_data is not None:
+            return known_data
+
+        started_at = time.monotonic()
+        try:
+            html = await self._fetch(fetcher, profile_url, 'profile-container')
+            if html is not None:
+                profile_data = self.extractor.parse_profile(profile_url, html)
+            else:
+                self.metrics.increment('http_fast_path_fallbacks')
+                profile_data = await self._browser_profile(profile_url)
+        except Exception as e:
+            self.defer_failure(e, page, profile_url, time.monotonic() - started_at)
+            return None
+
+        logging.info(f"[INFO] Scraped profile {profile_url}")
+        profile_data['profile_url'] = profile_url
+        self.record_profile(profile_url, profile_data)
+        return profile_data
+
+    async def _fetch(self, fetcher, url, marker):
+        async with self.semaphore:
+            if self.rate_controller:
+                await self.rate_controller.acquire_async()
+            started_at = time.monotonic()
+            with self.metrics.timer('async_fetch'):
+                html, failure = await fetcher.fetch(url, marker)
+            # A page that only needs rendering is no reason to slow down
+            if self.rate_controller:
+                self.rate_controller.record(
+                    time.monotonic() - started_at,
+                    error=failure is not None and failure != FETCH_CHALLENGE,
+                    challenge=failure == FETCH_CHALLENGE
+                )
+            return html
+
+    async def _browser_profile(self, profile_url):
+        # The HTTP attempt already took this profile's rate limiter token
+        if self.pool:
+            return await asyncio.wrap_future(self.pool.submit(profile_url, browser_only=True))
+        return await self._in_driver(self.profile_scraper.scrape_profile, profile_url, True)
+
+    @staticmethod
+    def _log_failure(error, page, profile_url=None, elapsed=None):
+        logging.error(f"Error scraping {f'profile {profile_url}' if profile_url else f'page {page}'}: {error}")
+
+    async def _in_driver(self, function, *args):
+        """Runs a blocking browser call on the thread owning the main driver."""
+        return await asyncio.get_running_loop().run_in_executor(self.driver_executor, function, *args)
@@ -0,0 +1,257 @@
+import argparse
+import json
+import re
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from config import ScraperConfig
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+class FixtureServer:
+    """
+    Local stand-in for upwork.com serving fixture pages over HTTP:
+    search_page.html for /nx/search/talent/ and profile.html for /freelancers/.
+    Profile links are made unique per page so deduplication does not skip them.
+    """
+    def __init__(self, fixtures_dir, latency=0.0):
+        """
+        Args:
+            fixtures_dir (Path): Directory holding search_page.html and profile.html
+            latency (float): Seconds of delay injected before every response
+        """
+        self.search_page = (fixtures_dir / 'search_page.html').read_text()
+        self.profile_page = (fixtures_dir / 'profile.html').read_text()
+        self.latency = latency
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def render_search_page(self, page):
+        html = self.search_page.replace('https://www.upwork.com', self.base_url)
+        return re.sub(r'(/freelancers/~\w+)', lambda m: f"{m.group(1)}p{page}", html)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(server.latency)
+                url = urlsplit(self.path)
+                if url.path.startswith('/nx/search/talent'):
+                    page = int(parse_qs(url.query).get('page', ['1'])[0])
+                    body = server.render_search_page(page)
+                elif url.path.startswith('/freelancers/'):
+                    body = server.profile_page
+                else:
+                    self.send_error(404)
+                    return
+                payload = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Turns a list of durations in seconds into count, total and p50/p95 in milliseconds."""
+    if not samples:
+        return {'count': 0}
+    return {
+        'count': len(samples),
+        'total_s': round(sum(samples), 4),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+    }
+
+
+def timed(samples, function, *args):
+    """Calls function, appends its duration to samples and returns its result."""
+    started_at = time.perf_counter()
+    result = function(*args)
+    samples.append(time.perf_counter() - started_at)
+    return result
+
+
+def bench_extractors(fixtures_dir, iterations):
+    """
+    Runs snapshot parsing and each extractor of ProfileScraper.EXTRACTORS offline on the profile fixture.
+
+    Returns:
+        tuple: (stages dict of duration lists, profiles per second)
+    """
+    from snapshot import PageSnapshot
+    from scraper import ProfileScraper
+
+    html = (fixtures_dir / 'profile.html').read_text()
+    config = ScraperConfig(http_fast_path=False, selector_stats_path=None)
+    profile_scraper = ProfileScraper(None, config)
+    extractors = [method for _, method, _ in ProfileScraper.EXTRACTORS]
+    stages = {'snapshot_parse': []}
+    stages.update({name: [] for name in extractors})
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        profile_scraper.root = timed(stages['snapshot_parse'], PageSnapshot, html)
+        for name in extractors:
+            timed(stages[name], getattr(profile_scraper, name))
+    elapsed = time.perf_counter() - started_at
+    return stages, iterations / elapsed
+
+
+def bench_browser(base_url, pages):
+    """
+    Runs PageScraper.extract_profile_links, ProfileScraper.scrape_profile and
+    Scraper.scrape_upwork in Chrome against the fixture server. Scraper settings
+    come from the SCRAPER_* environment, so modes can be compared.
+
+    Returns:
+        tuple: (stages dict of duration lists, profiles per second end to end)
+    """
+    from scraper import Scraper
+
+    config = ScraperConfig.from_env()
+    config.base_url = base_url
+    config.profile_delay = 0
+    config.page_delay = 0
+    config.journal_dir = None
+    config.cache_path = None
+    config.selector_stats_path = None
+
+    stages = {'extract_profile_links': [], 'scrape_profile': [], 'scrape_upwork': []}
+    search_url = f"{base_url}/nx/search/talent/?nbs=1&q=bench"
+
+    scraper = Scraper(config)
+    try:
+        scraper.start()
+        profile_urls = []
+        for page in range(1, pages + 1):
+            profile_urls = timed(stages['extract_profile_links'], scraper.page_scraper.extract_profile_links, search_url, page)
+        for profile_url in profile_urls:
+            timed(stages['scrape_profile'], scraper.profile_scraper.scrape_profile, profile_url)
+        results = timed(stages['scrape_upwork'], scraper.scrape_upwork, 'bench', pages) or []
+    finally:
+        scraper.stop()
+    return stages, len(results) / stages['scrape_upwork'][0]
+
+
+def bench_startup(runs):
+    """
+    Times fresh interpreter starts: the CLI's --help, which must not load the
+    browser stack, and the imports of scraper and of undetected_chromedriver.
+
+    Returns:
+        dict: Stage name -> list of durations
+    """
+    commands = {
+        'startup_cli_help': [sys.executable, 'main.py', '--help'],
+        'startup_import_scraper': [sys.executable, '-c', 'import scraper'],
+        'startup_import_browser': [sys.executable, '-c', 'import undetected_chromedriver'],
+    }
+    stages = {name: [] for name in commands}
+    for _ in range(runs):
+        for name, command in commands.items():
+            timed(stages[name], lambda: subprocess.run(
+                command, cwd=Path(__file__).parent, stdout=subprocess.DEVNULL, check=True
+            ))
+    return stages
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process and of its largest finished child (Chrome), in KB."""
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraper offline against local fixtures')
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES_DIR, help='Directory with search_page.html and profile.html')
+    parser.add_argument('--iterations', type=int, default=200, help='Profiles parsed by the offline extractor benchmark')
+    parser.add_argument('--pages', type=int, default=3, help='Search pages crawled by the browser benchmark')
+    parser.add_argument('--latency', type=float, default=0.0, help='Milliseconds of latency injected by the fixture server')
+    parser.add_argument('--startup-runs', type=int, default=5, help='Interpreter starts timed by the import-time benchmark, 0 to skip it')
+    parser.add_argument('--no-browser', action='store_true', help='Only run the offline extractor benchmark')
+    parser.add_argument('--output', default='bench_results.json', help='JSON file the results are written to')
+
+    args = parser.parse_args()
+
+    stages, offline_rate = bench_extractors(args.fixtures, args.iterations)
+    profiles_per_sec = {'offline_extraction': round(offline_rate, 2)}
+    stages.update(bench_startup(args.startup_runs))
+
+    if not args.no_browser:
+        server = FixtureServer(args.fixtures, args.latency / 1000)
+        server.start()
+        try:
+            browser_stages, browser_rate = bench_browser(server.base_url, args.pages)
+        finally:
+            server.stop()
+        stages.update(browser_stages)
+        profiles_per_sec['scrape_upwork'] = round(browser_rate, 2)
+
+    results = {
+        'commit': current_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'settings': {
+            'iterations': args.iterations,
+            'pages': args.pages,
+            'latency_ms': args.latency,
+            'startup_runs': args.startup_runs,
+            'browser': not args.no_browser,
+        },
+        'profiles_per_sec': profiles_per_sec,
+        'stages': {name: summarize(samples) for name, samples in stages.items()},
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for name, summary in results['stages'].items():
+        if summary['count']:
+            print(f"{name:32} p50 {summary['p50_ms']:9.3f} ms   p95 {summary['p95_ms']:9.3f} ms")
+    for name, rate in profiles_per_sec.items():
+        print(f"{name:32} {rate} profiles/sec")
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from urllib.parse import urlsplit, urlunsplit
+import json
+import sqlite3
+import threading
+import time
+
+
+def canonical_profile_url(url):
+    """
+    Normalizes a profile URL so the same freelancer maps to one cache key:
+    lowercase scheme and host, no query string, fragment or trailing slash.
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+
+class ProfileCache:
+    """
+    On-disk SQLite cache of scraped profiles keyed by canonical profile URL,
+    with a TTL on reads and size-bounded eviction of the oldest entries.
+    Entries can carry the fingerprint of the profile's search card, which
+    then decides freshness instead of the TTL (incremental refresh).
+    Safe to share between the pool's threads.
+    """
+    # Evict every N writes rather than on each one
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path, max_age_hours, max_entries):
+        """
+        Args:
+            path (str): SQLite database file
+            max_age_hours (float): Entries older than this are treated as misses
+            max_entries (int): Number of entries kept after eviction
+        """
+        self.max_age = max_age_hours * 3600
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS profiles ('
+            'url TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS profiles_fetched_at ON profiles (fetched_at)')
+        columns = [row[1] for row in self.connection.execute('PRAGMA table_info(profiles)')]
+        if 'fingerprint' not in columns:
+            # Caches created before incremental refresh
+            self.connection.execute('ALTER TABLE profiles ADD COLUMN fingerprint TEXT')
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        # Lookups decided by a search-card fingerprint
+        self.unchanged = 0
+        self.changed = 0
+
+    def get(self, profile_url, fingerprint=None):
+        """
+        Returns the cached profile data, or None if it should be scraped again.
+        
+        Args:
+            profile_url (str): URL of the profile
+            fingerprint (str): Optional fingerprint of the profile's current search card;
+                when both it and the cached one are known, the entry is reused if they
+                match and treated as a miss if they differ, whatever its age.
+                Otherwise entries older than max_age are misses.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT data, fetched_at, fingerprint FROM profiles WHERE url = ?',
+                (canonical_profile_url(profile_url),)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            data, fetched_at, cached_fingerprint = row
+            if fingerprint is not None and cached_fingerprint is not None:
+                if fingerprint != cached_fingerprint:
+                    self.changed += 1
+                    self.misses += 1
+                    return None
+                self.unchanged += 1
+            elif fetched_at < time.time() - self.max_age:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(data)
+
+    def put(self, profile_url, profile_data, fingerprint=None):
+        """Stores freshly scraped profile data, with the fingerprint of its search card if known."""
+        with self.lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO profiles (url, data, fetched_at, fingerprint) VALUES (?, ?, ?, ?)',
+                (canonical_profile_url(profile_url), json.dumps(profile_data), time.time(), fingerprint)
+            )
+            self.connection.commit()
+            self.writes += 1
+            if self.writes % self.EVICTION_INTERVAL == 0:
+                self._evict()
+
+    def close(self):
+        with self.lock:
+            self._evict()
+            self.connection.close()
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        summary = f"Profile cache: {self.hits} hits, {self.misses} misses ({rate:.0%})"
+        if self.unchanged or self.changed:
+            summary += (
+                f"; incremental refresh: {self.unchanged} skipped with an unchanged search card, "
+                f"{self.changed} refreshed after a card change"
+            )
+        return summary
+
+    def _evict(self):
+        self.connection.execute(
+            'DELETE FROM profiles WHERE url NOT IN '
+            '(SELECT url FROM profiles ORDER BY fetched_at DESC LIMIT ?)',
+            (self.max_entries,)
+        )
+        self.connection.commit()
@@ -9,9 +9,75 @@ class ScraperConfig:
     profile_delay: int = 2       # Delay between profile scrapes
     page_delay: int = 5         # Delay between page scrapes
     
+    # Adaptive rate control, replaces the fixed delays above when set
+    target_rpm: Optional[float] = None  # Highest request rate, in requests per minute
+    min_rpm: float = 2.0                # Floor the rate backs off to on errors
+    
+    # Site root, overridable to point the scraper at a local stand-in (see bench.py)
+    base_url: str = 'https://www.upwork.com'
+    
     # Chrome settings
     chrome_path: Optional[str] = None
     headless: bool = False
+    lean_mode: bool = False      # Block images, fonts, media and trackers, eager page loads
+    warm_start: bool = False     # Cached patched chromedriver and persistent browser profiles
+    warm_start_dir: str = '.chrome'  # Where the cached drivers and profiles are kept
+    
+    # Driver watchdog, recycling browsers before they degrade on long crawls
+    watchdog: bool = False
+    driver_max_navigations: int = 300  # Page loads before a browser is recycled (0 = no limit)
+    driver_max_rss_mb: float = 2048    # Memory of a browser's process tree before it is recycled (0 = no limit)
+    driver_max_failures: int = 3       # Pages failing in a row before a browser is recycled
+    navigation_deadline: float = 60    # Page load timeout; a navigation still stuck a bit later is killed
+    
+    # Deferred retries of pages and profiles failing on timeouts, challenge pages or dead drivers
+    retry_max_attempts: int = 3        # Retries at the end of each keyword's crawl (0 = drop failures)
+    retry_base_delay: float = 30       # Seconds before the first retry round, doubling each round
+    retry_max_delay: float = 300       # Cap of the delay between retry rounds
+    profile_time_budget: float = 180   # Seconds of attempts a profile gets in total before it is given up (0 = no limit)
+    
+    # Parallelism
+    workers: int = 1             # Number of browsers scraping profiles in parallel
+    prefetch_pages: int = 0      # Search pages fetched ahead of the profile workers (0 = off)
+    async_engine: bool = False   # Fetch pages and profiles as asyncio tasks over HTTP, browsers as fallback
+    async_concurrency: int = 16  # Fetches in flight at most with the async engine
+    
+    # Distributed crawl, workers sharing a work queue on a shared volume
+    queue_path: Optional[str] = None       # SQLite work queue of the enqueue and work commands
+    queue_lease_seconds: float = 600       # A task not heartbeated for this long goes back to the queue
+    queue_heartbeat_interval: float = 60   # Seconds between lease renewals of a worker
+    queue_poll_interval: float = 10        # Seconds an idle worker waits for other workers to queue more
+    queue_max_attempts: int = 3            # Claims of a task before it is marked failed
+    
+    # Pagination
+    auto_max_pages: int = 100    # Pages scraped at most when num_pages is 'auto'
+    
+    # Profile cache
+    cache_path: Optional[str] = None    # SQLite file caching profiles across runs (None = off)
+    cache_max_age_hours: float = 168    # Cached profiles older than this are scraped again
+    cache_max_entries: int = 100000     # Oldest entries are evicted beyond this size
+    incremental: bool = False           # Reuse cached profiles whose search card is unchanged, whatever their age
+    
+    # Shallow mode: search card summaries, with deep profile visits only for cards passing the filter
+    shallow: bool = False
+    deep_min_job_success: Optional[float] = None  # Deep-visit cards with at least this job success score
+    deep_min_rate: Optional[float] = None         # Deep-visit cards with at least this hourly rate
+    deep_max_rate: Optional[float] = None         # Deep-visit cards with at most this hourly rate
+    
+    # Crawl journal
+    journal_dir: Optional[str] = 'journal'  # Append-only per-keyword journal (None = off)
+    resume: bool = False                    # Skip pages and profiles already in the journal
+    
+    # Extraction
+    snapshot_extraction: bool = True  # Parse one page_source with lxml instead of live DOM lookups
+    http_fast_path: bool = False      # Try a plain HTTP GET with the driver's cookies before Chrome
+    capture_payloads: bool = False    # Read the site's own JSON API responses from Chrome's network log, DOM as fallback
+    selector_stats_path: Optional[str] = 'selector_stats.json'  # Selector hit-rate statistics kept between runs
+    archive_dir: Optional[str] = None  # Compressed store of every fetched profile page, for reparse (None = off)
+    
+    # Instrumentation
+    metrics_path: Optional[str] = None  # Periodic stage timing/counter snapshot, .prom for Prometheus (None = off)
+    metrics_interval: float = 30        # Seconds between snapshots
     
     @classmethod
     def from_env(cls):
@@ -20,6 +86,47 @@ class ScraperConfig:
             page_load_timeout=int(os.getenv('SCRAPER_PAGE_LOAD_TIMEOUT', 10)),
             profile_delay=int(os.getenv('SCRAPER_PROFILE_DELAY', 2)),
             page_delay=int(os.getenv('SCRAPER_PAGE_DELAY', 5)),
+            target_rpm=float(os.getenv('SCRAPER_TARGET_RPM')) if os.getenv('SCRAPER_TARGET_RPM') else None,
+            min_rpm=float(os.getenv('SCRAPER_MIN_RPM', 2)),
+            base_url=os.getenv('SCRAPER_BASE_URL', 'https://www.upwork.com'),
             chrome_path=os.getenv('CHROME_PATH'),
-            headless=os.getenv('SCRAPER_HEADLESS', '').lower() == 'true'
+            headless=os.getenv('SCRAPER_HEADLESS', '').lower() == 'true',
+            lean_mode=os.getenv('SCRAPER_LEAN_MODE', '').lower() == 'true',
+            warm_start=os.getenv('SCRAPER_WARM_START', '').lower() == 'true',
+            warm_start_dir=os.getenv('SCRAPER_WARM_START_DIR', '.chrome'),
+            watchdog=os.getenv('SCRAPER_WATCHDOG', '').lower() == 'true',
+            driver_max_navigations=int(os.getenv('SCRAPER_DRIVER_MAX_NAVIGATIONS', 300)),
+            driver_max_rss_mb=float(os.getenv('SCRAPER_DRIVER_MAX_RSS_MB', 2048)),
+            driver_max_failures=int(os.getenv('SCRAPER_DRIVER_MAX_FAILURES', 3)),
+            navigation_deadline=float(os.getenv('SCRAPER_NAVIGATION_DEADLINE', 60)),
+            retry_max_attempts=int(os.getenv('SCRAPER_RETRY_MAX_ATTEMPTS', 3)),
+            retry_base_delay=float(os.getenv('SCRAPER_RETRY_BASE_DELAY', 30)),
+            retry_max_delay=float(os.getenv('SCRAPER_RETRY_MAX_DELAY', 300)),
+            profile_time_budget=float(os.getenv('SCRAPER_PROFILE_TIME_BUDGET', 180)),
+            workers=int(os.getenv('SCRAPER_WORKERS', 1)),
+            prefetch_pages=int(os.getenv('SCRAPER_PREFETCH_PAGES', 0)),
+            async_engine=os.getenv('SCRAPER_ASYNC_ENGINE', '').lower() == 'true',
+            async_concurrency=int(os.getenv('SCRAPER_ASYNC_CONCURRENCY', 16)),
+            queue_path=os.getenv('SCRAPER_QUEUE_PATH') or None,
+            queue_lease_seconds=float(os.getenv('SCRAPER_QUEUE_LEASE_SECONDS', 600)),
+            queue_heartbeat_interval=float(os.getenv('SCRAPER_QUEUE_HEARTBEAT_INTERVAL', 60)),
+            queue_poll_interval=float(os.getenv('SCRAPER_QUEUE_POLL_INTERVAL', 10)),
+            queue_max_attempts=int(os.getenv('SCRAPER_QUEUE_MAX_ATTEMPTS', 3)),
+            auto_max_pages=int(os.getenv('SCRAPER_AUTO_MAX_PAGES', 100)),
+            cache_path=os.getenv('SCRAPER_CACHE_PATH') or None,
+            cache_max_age_hours=float(os.getenv('SCRAPER_CACHE_MAX_AGE_HOURS', 168)),
+            cache_max_entries=int(os.getenv('SCRAPER_CACHE_MAX_ENTRIES', 100000)),
+            incremental=os.getenv('SCRAPER_INCREMENTAL', '').lower() == 'true',
+            shallow=os.getenv('SCRAPER_SHALLOW', '').lower() == 'true',
+            deep_min_job_success=float(os.getenv('SCRAPER_DEEP_MIN_JOB_SUCCESS')) if os.getenv('SCRAPER_DEEP_MIN_JOB_SUCCESS') else None,
+            deep_min_rate=float(os.getenv('SCRAPER_DEEP_MIN_RATE')) if os.getenv('SCRAPER_DEEP_MIN_RATE') else None,
+            deep_max_rate=float(os.getenv('SCRAPER_DEEP_MAX_RATE')) if os.getenv('SCRAPER_DEEP_MAX_RATE') else None,
+            journal_dir=os.getenv('SCRAPER_JOURNAL_DIR', 'journal') or None,
+            snapshot_extraction=os.getenv('SCRAPER_SNAPSHOT_EXTRACTION', 'true').lower() == 'true',
+            http_fast_path=os.getenv('SCRAPER_HTTP_FAST_PATH', '').lower() == 'true',
+            capture_payloads=os.getenv('SCRAPER_CAPTURE_PAYLOADS', '').lower() == 'true',
+            selector_stats_path=os.getenv('SCRAPER_SELECTOR_STATS', 'selector_stats.json') or None,
+            archive_dir=os.getenv('SCRAPER_ARCHIVE_DIR') or None,
+            metrics_path=os.getenv('SCRAPER_METRICS_PATH') or None,
+            metrics_interval=float(os.getenv('SCRAPER_METRICS_INTERVAL', 30))
         ) 
\ No newline at end of file
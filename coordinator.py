@@ -0,0 +1,127 @@
+import time
+import logging
+from cache import canonical_profile_url
+from retry import classify_failure
+from workqueue import PAGE, Heartbeat
+
+
+class QueueWorker:
+    """
+    Scrapes tasks pulled from a shared WorkQueue until it is drained, so that
+    scrapers on several machines split a crawl between them. A search page
+    task queues the page's profiles, with the search card data seen on it,
+    for whichever worker claims them next.
+    """
+    def __init__(self, page_scraper, profile_scraper, queue, config, worker_id, search_url,
+                 lookup_profile=None, record_profile=None, cards=None, fingerprints=None, on_task_complete=None):
+        """
+        Args:
+            page_scraper: PageScraper of the worker's browser
+            profile_scraper: ProfileScraper of the worker's browser
+            queue (WorkQueue): Queue shared by all workers
+            config: ScraperConfig instance
+            worker_id (str): Unique name of the worker, holding its leases
+            search_url (callable): Returns the base search URL of a keyword
+            lookup_profile (callable): Optional, returns known data for a URL instead of scraping it
+            record_profile (callable): Optional, called with (url, data) for each scraped profile
+            cards (dict): Optional canonical URL -> search card, filled in from the tasks for lookup_profile
+            fingerprints (dict): Optional canonical URL -> card fingerprint, filled in likewise
+            on_task_complete (callable): Optional, called with each task done
+        """
+        self.page_scraper = page_scraper
+        self.profile_scraper = profile_scraper
+        self.queue = queue
+        self.config = config
+        self.worker_id = worker_id
+        self.search_url = search_url
+        self.lookup_profile = lookup_profile
+        self.record_profile = record_profile
+        self.cards = cards
+        self.fingerprints = fingerprints
+        self.on_task_complete = on_task_complete
+        # Keyword whose pagination the page scraper is tracking
+        self.keyword = None
+        self.tasks_done = 0
+        self.tasks_failed = 0
+
+    def run(self):
+        """Claims and scrapes tasks until none is pending or leased to another worker."""
+        heartbeat = Heartbeat(self.queue, self.worker_id, self.config.queue_heartbeat_interval)
+        heartbeat.start()
+        try:
+            while True:
+                task = self.queue.claim(self.worker_id)
+                if task is None:
+                    if self.queue.is_drained():
+                        break
+                    # Other workers may still queue profiles from the pages they hold
+                    time.sleep(self.config.queue_poll_interval)
+                    continue
+
+                try:
+                    if task.kind == PAGE:
+                        self._scrape_page(task)
+                    else:
+                        self._scrape_profile(task)
+                except Exception as e:
+                    category = classify_failure(e)
+                    logging.error(f"[QUEUE] Error on {task} (attempt {task.attempts}, {category}): {e}")
+                    self.queue.fail(task, self.worker_id, f"{category}: {e}")
+                    self.tasks_failed += 1
+                    continue
+
+                if not self.queue.complete(task, self.worker_id):
+                    logging.warning(f"[QUEUE] Lease of {task} expired before it was done, another worker may redo it")
+                self.tasks_done += 1
+                if self.on_task_complete:
+                    self.on_task_complete(task)
+        finally:
+            heartbeat.stop()
+
+    def _scrape_page(self, task):
+        if task.keyword != self.keyword:
+            self.page_scraper.reset_pagination()
+            self.keyword = task.keyword
+        if not self.page_scraper.wants_page(task.page):
+            return
+
+        logging.info(f"[QUEUE] Scraping page {task.page} of '{task.keyword}'")
+        profile_urls = self.page_scraper.extract_profile_links(self.search_url(task.keyword), task.page)
+        added = self.queue.add_profiles(
+            task.keyword, profile_urls, {url: self._card_data(url) for url in profile_urls}
+        )
+        logging.info(f"[QUEUE] Queued {len(added)} of the {len(profile_urls)} profiles of page {task.page}")
+
+        if self.page_scraper.last_page is not None:
+            self.queue.skip_pages(task.keyword, self.page_scraper.last_page)
+        if not self.config.target_rpm:
+            time.sleep(self.config.page_delay)
+
+    def _scrape_profile(self, task):
+        canonical_url = canonical_profile_url(task.url)
+        if self.cards is not None and task.data.get('card') is not None:
+            self.cards[canonical_url] = task.data['card']
+        if self.fingerprints is not None and task.data.get('fingerprint') is not None:
+            self.fingerprints[canonical_url] = task.data['fingerprint']
+
+        known_data = self.lookup_profile(task.url) if self.lookup_profile else None
+        if known_data is not None:
+            return
+
+        logging.info(f"[QUEUE] Scraping profile {task.url}")
+        profile_data = self.profile_scraper.scrape_profile(task.url)
+        profile_data['profile_url'] = task.url
+        if self.record_profile:
+            self.record_profile(task.url, profile_data)
+        if not self.config.target_rpm:
+            time.sleep(self.config.profile_delay)
+
+    def _card_data(self, profile_url):
+        """Search card and fingerprint seen for a profile on this worker's page, for the worker scraping it."""
+        canonical_url = canonical_profile_url(profile_url)
+        data = {}
+        if self.cards is not None and self.cards.get(canonical_url) is not None:
+            data['card'] = self.cards[canonical_url]
+        if self.fingerprints is not None and self.fingerprints.get(canonical_url) is not None:
+            data['fingerprint'] = self.fingerprints[canonical_url]
+        return data or None
@@ -0,0 +1,129 @@
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+
+# Substrings that identify an anti-bot interstitial instead of real content
+CHALLENGE_MARKERS = (
+    'challenge-platform',
+    'cf-chl-',
+    '<title>Just a moment',
+    'px-captcha',
+)
+
+
+# Why a fetch returned no page, when the request itself went wrong; a usable
+# response that just lacks the marker (a page that needs rendering) is neither
+FETCH_ERROR = 'error'
+FETCH_CHALLENGE = 'challenge'
+
+
+class ChallengePageError(Exception):
+    """Raised when the site serves an anti-bot challenge instead of the expected page."""
+
+
+def is_challenge_page(html):
+    """Checks whether an HTML document is an anti-bot challenge page."""
+    return any(marker in html for marker in CHALLENGE_MARKERS)
+
+
+class FetchStats:
+    """Thread-safe counters for the HTTP fast path, shared by every fetcher of a run."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+
+    def record(self, hit):
+        with self.lock:
+            self.attempts += 1
+            if hit:
+                self.hits += 1
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    def summary(self):
+        return f"HTTP fast path: {self.hits}/{self.attempts} hits ({self.hit_rate:.0%})"
+
+
+class HttpFetcher:
+    """
+    Fetches pages over a pooled keep-alive requests.Session that borrows
+    the cookies and user agent of a live Chrome driver.
+    Returns None whenever the browser is needed instead.
+    """
+    def __init__(self, driver, config, stats=None, pool_size=4):
+        """
+        Args:
+            driver: Chrome driver whose cookies and user agent are reused
+            config: ScraperConfig instance
+            stats (FetchStats): Optional shared counters
+            pool_size (int): Keep-alive connections kept per host
+        """
+        self.driver = driver
+        self.config = config
+        self.stats = stats or FetchStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.synced = False
+
+    def sync_from_driver(self):
+        """Copies the driver's cookies and user agent into the session."""
+        self.session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent")
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/')
+            )
+        self.synced = True
+
+    def fetch(self, url, marker, sync=True):
+        """
+        Fetches a page over HTTP.
+
+        Args:
+            url (str): URL to fetch
+            marker (str): Text that must appear in a usable page, e.g. a container class
+            sync (bool): Sync cookies from the driver first if needed; callers that do
+                not own the driver pass False and sync on the driver's thread themselves
+
+        Returns:
+            str: The page HTML, or None if the browser should be used instead
+        """
+        return self.fetch_page(url, marker, sync)[0]
+
+    def fetch_page(self, url, marker, sync=True):
+        """
+        Same as fetch, also telling a failed request apart from a page that needs the browser to render.
+
+        Returns:
+            tuple: (HTML or None, FETCH_ERROR on a transport error or non-2xx status,
+                FETCH_CHALLENGE on a challenge page, else None)
+        """
+        html = None
+        failure = None
+        try:
+            if sync and not self.synced:
+                self.sync_from_driver()
+            response = self.session.get(url, timeout=self.config.page_load_timeout)
+            if not 200 <= response.status_code < 300:
+                failure = FETCH_ERROR
+            elif is_challenge_page(response.text):
+                failure = FETCH_CHALLENGE
+            elif marker in response.text:
+                html = response.text
+        except Exception as e:
+            logging.debug(f"HTTP fast path failed for {url}: {e}")
+            failure = FETCH_ERROR
+
+        self.stats.record(html is not None)
+        if html is None:
+            # The browser fallback may refresh clearance cookies, pick them up next time
+            self.synced = False
+        return html, failure
@@ -0,0 +1,124 @@
+from pathlib import Path
+import json
+import os
+import threading
+import logging
+
+
+def journal_path(journal_dir, keyword):
+    """Returns the journal file of a keyword inside journal_dir."""
+    return Path(journal_dir) / f"{keyword.replace(' ', '_')}.ndjson"
+
+
+class CrawlJournal:
+    """
+    Append-only NDJSON journal of a crawl, one file per keyword.
+    Records every scraped profile as it lands and every completed page,
+    so an interrupted crawl can be resumed without re-scraping.
+    """
+    def __init__(self, path, resume=False, fsync_every=20):
+        """
+        Args:
+            path (str): Journal file
+            resume (bool): Load and extend an existing journal instead of starting over
+            fsync_every (int): Profile records written between two fsyncs
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.lock = threading.Lock()
+        self.profiles = {}
+        self.pages = {}
+        self.unsynced = 0
+
+        if resume and self.path.exists():
+            self._load()
+        self.file = open(self.path, 'a' if resume else 'w')
+        if resume and self.path.stat().st_size:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Terminate a half-written last line so new records stay parseable
+                    self.file.write('\n')
+
+    @classmethod
+    def for_keyword(cls, journal_dir, keyword, resume=False):
+        """Opens the journal of a keyword inside journal_dir."""
+        return cls(journal_path(journal_dir, keyword), resume)
+
+    @staticmethod
+    def read(path):
+        """
+        Reads a journal without opening it for writing.
+
+        Returns:
+            tuple: (profiles, pages) as dicts of profile URL -> data, in journal
+                order, and page number -> profile URLs
+        """
+        profiles = {}
+        pages = {}
+        with open(path) as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave the last line half written
+                    logging.warning(f"Ignoring corrupt journal line {line_number} in {path}")
+                    continue
+                if record['type'] == 'profile':
+                    profiles[record['url']] = record['data']
+                elif record['type'] == 'page':
+                    pages[record['page']] = record['profiles']
+        return profiles, pages
+
+    def completed_pages(self):
+        """
+        Returns:
+            dict: page number -> profile data of that page, in page order,
+                for the pages completed by an earlier run
+        """
+        return {
+            page: [self.profiles[url] for url in urls if url in self.profiles]
+            for page, urls in self.pages.items()
+        }
+
+    def get_profile(self, profile_url):
+        """Returns the data of a profile journaled by an earlier run, or None."""
+        return self.profiles.get(profile_url)
+
+    def record_profile(self, profile_url, profile_data):
+        """
+        Appends a scraped profile; synced to disk in batches.
+        Only written out, not kept in memory, so long crawls stay flat.
+        """
+        with self.lock:
+            self._write({'type': 'profile', 'url': profile_url, 'data': profile_data})
+            self.unsynced += 1
+            if self.unsynced >= self.fsync_every:
+                self._sync()
+
+    def record_page(self, page, profile_urls):
+        """Appends a completed page and syncs everything written so far."""
+        with self.lock:
+            self.pages[page] = list(profile_urls)
+            self._write({'type': 'page', 'page': page, 'profiles': list(profile_urls)})
+            self._sync()
+
+    def close(self):
+        with self.lock:
+            self._sync()
+            self.file.close()
+
+    def _write(self, record):
+        self.file.write(json.dumps(record) + '\n')
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+
+    def _load(self):
+        self.profiles, self.pages = self.read(self.path)
+        logging.info(
+            f"[INFO] Resuming from journal: {len(self.pages)} pages, {len(self.profiles)} profiles done"
+        )
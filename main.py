@@ -1,54 +1,303 @@
 import argparse
 import json
-import os
-from pathlib import Path
+import sys
+from dataclasses import replace
 from dotenv import load_dotenv
-from scraper import Scraper
 from config import ScraperConfig
+from sinks import OUTPUT_FORMATS, open_sink
+from journal import CrawlJournal, journal_path
 
-def save_temp_results(results, keyword, page_num):
-    """Save temporary results for a specific page"""
-    # Create temp directory if it doesn't exist
-    temp_dir = Path('temp_results')
-    temp_dir.mkdir(exist_ok=True)
-    
-    # Save results for this page
-    filename = f"temp_results/{keyword.replace(' ', '_')}_page_{page_num}.json"
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
-
-def main():
-    parser = argparse.ArgumentParser(description='Scrape Upwork profiles based on keyword')
-    parser.add_argument('keyword', help='Keyword to search for')
-    parser.add_argument('num_pages', type=int, help='Number of pages to scrape')
+COMMANDS = ('scrape', 'resume', 'export', 'reparse', 'enqueue', 'work')
+# Commands whose first positional is never a page count, so "main.py work 3" can only mean the keyword
+NO_PAGE_COUNT_COMMANDS = ('export', 'reparse', 'work')
+
+def read_keywords(path):
+    """Reads one keyword per line, skipping blank lines and # comments"""
+    with open(path) as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith('#')]
+
+def page_count(value):
+    """Parses num_pages: a positive number of pages, or 'auto'"""
+    if value == 'auto':
+        return value
+    try:
+        pages = int(value)
+    except ValueError:
+        pages = 0
+    if pages < 1:
+        raise argparse.ArgumentTypeError(f"expected a number of pages or 'auto', got {value!r}")
+    return pages
+
+def add_output_arguments(parser):
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='json', help='Format of the results file')
+    parser.add_argument('--output', help='Results file (default: result.<format>)')
+
+def add_keyword_arguments(parser):
+    parser.add_argument('keyword', nargs='?', help='Keyword to search for')
+    parser.add_argument('num_pages', type=page_count, help="Number of pages to scrape (per keyword in batch mode), or 'auto' for all of them")
+    parser.add_argument('--keywords-file', help='Batch mode: file with one keyword per line, profiles deduplicated across keywords')
+
+def add_browser_arguments(parser):
     parser.add_argument('--headless', action='store_true', help='Run in headless mode')
-    parser.add_argument('--no-temp', action='store_true', help='Disable temporary saves')
-    
-    args = parser.parse_args()
-    
-    # Create config from env variables with CLI headless override
+    parser.add_argument('--lean', action='store_true', help='Block images, fonts, media and trackers and use eager page loads')
+    parser.add_argument('--warm-start', action='store_true', help='Reuse a cached patched chromedriver and persistent browser profiles')
+    parser.add_argument('--watchdog', action='store_true', help='Recycle browsers on memory growth, navigation count or repeated failures, and kill stuck navigations')
+    parser.add_argument('--max-navigations', type=int, help='With --watchdog, page loads before a browser is recycled')
+    parser.add_argument('--max-rss-mb', type=float, help="With --watchdog, memory of a browser's processes before it is recycled")
+    parser.add_argument('--target-rpm', type=float, help='Adaptive rate limit in requests per minute, replaces the fixed delays')
+    parser.add_argument('--http-fast-path', action='store_true', help='Try plain HTTP requests before navigating Chrome')
+    parser.add_argument('--capture', action='store_true', help="Read profiles and search results from the site's JSON API responses, DOM as fallback")
+    parser.add_argument('--cache', help='SQLite file caching scraped profiles across runs')
+    parser.add_argument('--max-age', type=float, help='Re-scrape cached profiles older than this many hours')
+    parser.add_argument('--incremental', action='store_true', help='Only re-scrape cached profiles whose search card changed (needs --cache)')
+    parser.add_argument('--shallow', action='store_true', help='Take profiles from their search result card instead of visiting them')
+    parser.add_argument('--deep-min-jss', type=float, help='With --shallow, visit profiles whose card shows at least this job success score')
+    parser.add_argument('--deep-min-rate', type=float, help='With --shallow, visit profiles whose card shows at least this hourly rate')
+    parser.add_argument('--deep-max-rate', type=float, help='With --shallow, visit profiles whose card shows at most this hourly rate')
+    parser.add_argument('--archive', help='Keep every fetched profile page, compressed, in this directory for reparse')
+    parser.add_argument('--metrics', help='Write stage timings and counters to this file periodically (.prom for Prometheus, else JSON)')
+    add_output_arguments(parser)
+
+def add_scrape_arguments(parser):
+    add_keyword_arguments(parser)
+    parser.add_argument('--no-temp', action='store_true', help='Disable the crawl journal')
+    parser.add_argument('--retries', type=int, help='Retries of pages and profiles failing on timeouts, challenges or dead drivers, at the end of each keyword (0 to drop them)')
+    parser.add_argument('--workers', type=int, help='Number of browsers scraping profiles in parallel')
+    parser.add_argument('--prefetch', type=int, help='Number of search pages to fetch ahead of profile scraping')
+    parser.add_argument('--async', dest='async_engine', action='store_true', help='Fetch pages and profiles concurrently with the asyncio engine')
+    parser.add_argument('--concurrency', type=int, help='Fetches in flight at most with --async')
+    add_browser_arguments(parser)
+
+def add_queue_argument(parser):
+    parser.add_argument('--queue', help='SQLite work queue on a volume shared by the workers (default: SCRAPER_QUEUE_PATH)')
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Scrape Upwork profiles based on keyword')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help='Scrape search results and profiles (default command)')
+    add_scrape_arguments(scrape)
+    scrape.add_argument('--resume', action='store_true', help='Resume an interrupted crawl from its journal')
+    scrape.set_defaults(handler=run_scrape, parser=scrape)
+
+    resume = commands.add_parser('resume', help='Resume an interrupted crawl from its journal')
+    add_scrape_arguments(resume)
+    resume.set_defaults(handler=run_scrape, parser=resume, resume=True)
+
+    export = commands.add_parser('export', help="Write the profiles of a keyword's crawl journal to a results file, without a browser")
+    export.add_argument('keyword', help='Keyword whose journal to export')
+    export.add_argument('--journal-dir', help='Directory of the crawl journals (default: SCRAPER_JOURNAL_DIR or journal)')
+    add_output_arguments(export)
+    export.set_defaults(handler=run_export, parser=export)
+
+    reparse = commands.add_parser('reparse', help='Re-run the extractors over archived profile pages, without a browser')
+    reparse.add_argument('--archive', help='Archive directory (default: SCRAPER_ARCHIVE_DIR)')
+    reparse.add_argument('--processes', type=int, help='Worker processes (default: one per core)')
+    add_output_arguments(reparse)
+    reparse.set_defaults(handler=run_reparse, parser=reparse)
+
+    enqueue = commands.add_parser('enqueue', help='Queue the search pages of keywords for the workers of a distributed crawl')
+    add_keyword_arguments(enqueue)
+    add_queue_argument(enqueue)
+    enqueue.set_defaults(handler=run_enqueue, parser=enqueue)
+
+    work = commands.add_parser('work', help='Scrape tasks from a shared work queue until it is drained, alongside other workers')
+    add_queue_argument(work)
+    work.add_argument('--worker-id', help='Unique name of this worker (default: host-pid)')
+    add_browser_arguments(work)
+    work.set_defaults(handler=run_work, parser=work)
+
+    return parser
+
+def browser_config(args):
+    """Creates config from env variables with the CLI browser options applied"""
     config = ScraperConfig.from_env()
     config.headless = args.headless
-    
+    if args.lean:
+        config.lean_mode = True
+    if args.warm_start:
+        config.warm_start = True
+    if args.watchdog:
+        config.watchdog = True
+    if args.max_navigations is not None:
+        config.driver_max_navigations = args.max_navigations
+    if args.max_rss_mb is not None:
+        config.driver_max_rss_mb = args.max_rss_mb
+    if args.target_rpm:
+        config.target_rpm = args.target_rpm
+    if args.http_fast_path:
+        config.http_fast_path = True
+    if args.capture:
+        config.capture_payloads = True
+    if args.cache:
+        config.cache_path = args.cache
+    if args.max_age is not None:
+        config.cache_max_age_hours = args.max_age
+    if args.incremental:
+        config.incremental = True
+    if config.incremental and not config.cache_path:
+        args.parser.error('--incremental needs --cache or SCRAPER_CACHE_PATH')
+    if args.shallow:
+        config.shallow = True
+    if args.deep_min_jss is not None:
+        config.deep_min_job_success = args.deep_min_jss
+    if args.deep_min_rate is not None:
+        config.deep_min_rate = args.deep_min_rate
+    if args.deep_max_rate is not None:
+        config.deep_max_rate = args.deep_max_rate
+    deep_filter = (config.deep_min_job_success, config.deep_min_rate, config.deep_max_rate)
+    if not config.shallow and any(bound is not None for bound in deep_filter):
+        args.parser.error('--deep-min-jss, --deep-min-rate and --deep-max-rate need --shallow or SCRAPER_SHALLOW')
+    if args.metrics:
+        config.metrics_path = args.metrics
+    if args.archive:
+        config.archive_dir = args.archive
+    return config
+
+def run_scrape(args):
+    if bool(args.keyword) == bool(args.keywords_file):
+        args.parser.error('give either a keyword or --keywords-file')
+
+    # Imported here so --help and offline commands do not load the browser stack
+    from scraper import Scraper
+
+    config = browser_config(args)
+    if args.workers:
+        config.workers = args.workers
+    if args.prefetch is not None:
+        config.prefetch_pages = args.prefetch
+    if args.async_engine:
+        config.async_engine = True
+    if args.concurrency:
+        config.async_concurrency = args.concurrency
+    if args.retries is not None:
+        config.retry_max_attempts = args.retries
+    config.journal_dir = None if args.no_temp else config.journal_dir
+    config.resume = args.resume
+
     scraper = Scraper(config)
-    all_results = []
-    
+    output_path = args.output or f"result.{args.output_format}"
+
     try:
-        result = scraper.scrape_upwork(
-            args.keyword, 
-            args.num_pages,
-            lambda page_results, page_num: None if args.no_temp else save_temp_results(page_results, args.keyword, page_num)
-        )
-        
-        if result:
-            print(f"Successfully scraped {len(result)} profiles")
-            with open('result.json', 'w') as f:
-                json.dump(result, f, indent=2)
+        with open_sink(args.output_format, output_path) as sink:
+            if args.keywords_file:
+                scraper.scrape_keywords(read_keywords(args.keywords_file), args.num_pages, sink=sink)
+                with open('keyword_matches.json', 'w') as f:
+                    json.dump(scraper.keyword_matches(), f, indent=2)
+            else:
+                scraper.scrape_upwork(args.keyword, args.num_pages, sink=sink)
+
+        if sink.count:
+            print(f"Successfully scraped {sink.count} profiles")
         else:
             print("No profiles found")
     finally:
         scraper.stop()
 
+def run_export(args):
+    path = journal_path(args.journal_dir or ScraperConfig.from_env().journal_dir or 'journal', args.keyword)
+    if not path.exists():
+        args.parser.error(f"no journal for '{args.keyword}' at {path}")
+    profiles, pages = CrawlJournal.read(path)
+    output_path = args.output or f"result.{args.output_format}"
+
+    with open_sink(args.output_format, output_path) as sink:
+        for profile_data in profiles.values():
+            sink.write(profile_data)
+
+    print(f"Exported {sink.count} profiles ({len(pages)} completed pages) to {output_path}")
+
+def run_reparse(args):
+    from reparse import reparse_archive
+
+    config = ScraperConfig.from_env()
+    archive_dir = args.archive or config.archive_dir
+    if not archive_dir:
+        args.parser.error('give --archive or set SCRAPER_ARCHIVE_DIR')
+    # Workers only parse, and their selector statistics would overwrite each other
+    config = replace(config, http_fast_path=False, selector_stats_path=None)
+    output_path = args.output or f"result.{args.output_format}"
+
+    with open_sink(args.output_format, output_path) as sink:
+        failures = reparse_archive(archive_dir, config, sink, args.processes)
+
+    print(f"Reparsed {sink.count} profiles to {output_path}" + (f", {failures} failed" if failures else ""))
+
+def open_queue(args, config):
+    from workqueue import SqliteWorkQueue
+
+    path = args.queue or config.queue_path
+    if not path:
+        args.parser.error('give --queue or set SCRAPER_QUEUE_PATH')
+    return SqliteWorkQueue(path, config.queue_lease_seconds, config.queue_max_attempts)
+
+def run_enqueue(args):
+    if bool(args.keyword) == bool(args.keywords_file):
+        args.parser.error('give either a keyword or --keywords-file')
+    config = ScraperConfig.from_env()
+    keywords = read_keywords(args.keywords_file) if args.keywords_file else [args.keyword]
+    # With auto, the pages past the last one are skipped by the worker that finds it
+    num_pages = config.auto_max_pages if args.num_pages == 'auto' else args.num_pages
+
+    queue = open_queue(args, config)
+    try:
+        added = sum(queue.add_pages(keyword, range(1, num_pages + 1)) for keyword in keywords)
+        print(f"Queued {added} search pages of {len(keywords)} keywords. {queue.summary()}")
+    finally:
+        queue.close()
+
+def run_work(args):
+    from scraper import Scraper
+
+    config = browser_config(args)
+    # One browser per worker: run several workers for more parallelism. The queue
+    # replaces the crawl journal, and its leases the per-run resume
+    config.workers = 1
+    config.prefetch_pages = 0
+    config.async_engine = False
+    config.journal_dir = None
+
+    queue = open_queue(args, config)
+    scraper = Scraper(config)
+    output_path = args.output or f"result.{args.output_format}"
+
+    try:
+        with open_sink(args.output_format, output_path) as sink:
+            scraper.work(queue, args.worker_id, sink)
+        print(f"Scraped {sink.count} profiles to {output_path}. {queue.summary()}")
+    finally:
+        scraper.stop()
+        queue.close()
+
+def is_scrape_shorthand(argv):
+    """
+    Tells a bare "main.py keyword num_pages" invocation, run as the scrape command,
+    from a subcommand. A keyword spelled like export, reparse or work counts as one
+    when a page count follows it; scrape, resume and enqueue take a page count first
+    in batch mode, so keywords named like them need an explicit scrape.
+    """
+    if not argv or argv[0] in ('-h', '--help'):
+        return False
+    if argv[0] not in COMMANDS:
+        return True
+    if argv[0] not in NO_PAGE_COUNT_COMMANDS or len(argv) < 2:
+        return False
+    try:
+        page_count(argv[1])
+    except argparse.ArgumentTypeError:
+        return False
+    return True
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if is_scrape_shorthand(argv):
+        argv = ['scrape'] + argv
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    args.handler(args)
+
 if __name__ == "__main__":
     load_dotenv()  # Load environment variables from .env file
     main()
@@ -0,0 +1,178 @@
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+import json
+import os
+import threading
+import time
+import logging
+
+# Prefix of every metric in the Prometheus textfile format
+PROMETHEUS_PREFIX = 'upwork_scraper'
+
+
+class NullMetrics:
+    """Stand-in used when instrumentation is off: every call is a no-op."""
+    _TIMER = nullcontext()
+
+    def timer(self, stage):
+        return self._TIMER
+
+    def observe(self, stage, seconds):
+        pass
+
+    def increment(self, counter, amount=1):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class StageTimer:
+    """Count, total and maximum duration of one stage."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 6),
+            'avg_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Thread-safe stage timers and event counters shared by every scraper of a run.
+    Timers cover navigation, waits and each extractor; counters cover errors,
+    retries and empty sections.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.timers = {}
+        self.counters = {}
+
+    @contextmanager
+    def timer(self, stage):
+        """Times the wrapped block as one observation of stage, even if it raises."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started_at)
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            timer = self.timers.get(stage)
+            if timer is None:
+                timer = self.timers[stage] = StageTimer()
+            timer.observe(seconds)
+
+    def increment(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Uptime, timers by stage and counters, as plain JSON-serializable values
+        """
+        with self.lock:
+            return {
+                'uptime_s': round(time.time() - self.started_at, 3),
+                'timers': {stage: timer.to_dict() for stage, timer in sorted(self.timers.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def to_prometheus(self):
+        """Renders the metrics in the Prometheus text exposition format."""
+        with self.lock:
+            timers = sorted(self.timers.items())
+            counters = sorted(self.counters.items())
+            uptime = time.time() - self.started_at
+
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds Time spent per scraping stage",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds summary",
+        ]
+        for stage, timer in timers:
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {timer.total:.6f}')
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds_count{{stage="{stage}"}} {timer.count}')
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_max_seconds Longest observation per scraping stage",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_max_seconds gauge",
+        ]
+        for stage, timer in timers:
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_max_seconds{{stage="{stage}"}} {timer.max:.6f}')
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_events_total Errors, retries and empty sections",
+            f"# TYPE {PROMETHEUS_PREFIX}_events_total counter",
+        ]
+        for counter, value in counters:
+            lines.append(f'{PROMETHEUS_PREFIX}_events_total{{event="{counter}"}} {value}')
+        lines += [
+            f"# HELP {PROMETHEUS_PREFIX}_uptime_seconds Seconds since the run started",
+            f"# TYPE {PROMETHEUS_PREFIX}_uptime_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_uptime_seconds {uptime:.3f}",
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """
+        Writes a snapshot atomically, so collectors never read a partial file.
+        Paths ending in .prom get the Prometheus textfile format, others JSON.
+        """
+        path = Path(path)
+        if path.suffix == '.prom':
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.snapshot(), indent=2)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+
+class MetricsWriter:
+    """Background thread writing a Metrics snapshot every interval seconds, and once more on stop."""
+    def __init__(self, metrics, path, interval=30.0):
+        """
+        Args:
+            metrics (Metrics): Metrics to snapshot
+            path (str): Snapshot file, .prom for Prometheus textfile format, else JSON
+            interval (float): Seconds between snapshots
+        """
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='metrics-writer', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread:
+            self.stopped.set()
+            self.thread.join()
+            self.thread = None
+        self._write()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            self._write()
+
+    def _write(self):
+        try:
+            self.metrics.write(self.path)
+        except OSError as e:
+            logging.warning(f"Could not write metrics to {self.path}: {e}")
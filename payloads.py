@@ -0,0 +1,351 @@
+import base64
+import json
+import re
+import time
+import logging
+from urllib.parse import urljoin
+
+# API responses the profile and search pages load their data from
+PROFILE_API_PATTERN = re.compile(r'/freelancers/api/v\d+/freelancer/profile/|/api/graphql/v\d+.*(profile|Profile)')
+SEARCH_API_PATTERN = re.compile(r'/search/profiles/api/|/api/graphql/v\d+.*(search|Search)')
+
+# Where each field is found in the captured payloads, as fallback chains of dotted
+# key paths tried in order, like SELECTOR_CHAINS for the DOM. Update these when the
+# API changes; a section whose key field is missing is extracted from the DOM instead.
+PROFILE_PATHS = {
+    'name': ['profile.profile.name', 'data.talentProfile.profile.name', 'profile.name'],
+    'title': ['profile.profile.title', 'data.talentProfile.profile.title', 'profile.title'],
+    'description': ['profile.profile.description', 'data.talentProfile.profile.description', 'profile.overview'],
+    'job_success': ['profile.stats.jobSuccessScore', 'data.talentProfile.stats.jobSuccessScore', 'stats.jobSuccessScore'],
+    'total_jobs': ['profile.stats.totalJobsWorked', 'data.talentProfile.stats.totalJobsWorked', 'stats.totalJobsWorked'],
+    'total_hours': ['profile.stats.totalHours', 'data.talentProfile.stats.totalHours', 'stats.totalHours'],
+    'hourly_rate': ['profile.stats.hourlyRate.amount', 'profile.profile.hourlyRate.amount', 'data.talentProfile.rate.amount'],
+    'hours_per_week': ['profile.availability.capacity', 'data.talentProfile.availability.hoursPerWeek'],
+    'response_time': ['profile.availability.responseTime', 'data.talentProfile.availability.responseTime'],
+    'contract_to_hire': ['profile.profile.contractToHire', 'data.talentProfile.contractToHire'],
+    'consultation_rate': ['profile.consultation.rate.amount', 'data.talentProfile.consultation.rate.amount'],
+    'consultation_duration': ['profile.consultation.duration', 'data.talentProfile.consultation.duration'],
+    'consultation_type': ['profile.consultation.type', 'data.talentProfile.consultation.type'],
+    'work_history': ['profile.assignments', 'data.talentProfile.workHistory', 'workHistory', 'assignments'],
+    'skills': ['profile.profile.skills', 'data.talentProfile.skills', 'profile.skills'],
+    'project_catalog': ['profile.projectCatalog', 'data.talentProfile.projectCatalog', 'projectCatalog.projects'],
+    'testimonials': ['profile.testimonials', 'data.talentProfile.testimonials', 'testimonials'],
+}
+
+# Fields of the items of the lists above
+ITEM_PATHS = {
+    'job_title': ['title', 'jobTitle', 'opening.title'],
+    'job_rating': ['feedback.score', 'rating'],
+    'job_start': ['startDate', 'dates.start'],
+    'job_end': ['endDate', 'dates.end'],
+    'job_feedback': ['feedback.comment', 'comment'],
+    'skill_name': ['prettyName', 'name', 'skill'],
+    'skill_group': ['groupName', 'category'],
+    'project_title': ['title'],
+    'project_price': ['price.amount', 'startingPrice.amount', 'price'],
+    'project_price_type': ['price.type', 'startingPrice.type', 'priceType'],
+    'project_delivery': ['deliveryTime.value', 'deliveryTime.duration', 'deliveryTime', 'deliveryDays'],
+    'project_delivery_unit': ['deliveryTime.unit', 'deliveryUnit'],
+    'testimonial_text': ['description', 'text'],
+    'testimonial_author': ['author.name', 'clientName', 'name'],
+    'testimonial_position': ['author.title', 'clientTitle'],
+    'testimonial_date': ['createdDateTime', 'date'],
+    'testimonial_verified': ['verified', 'isVerified'],
+}
+
+SEARCH_PATHS = {
+    'results': ['data.search.talentSearch.profiles', 'results.profiles', 'profiles'],
+    'total': ['data.search.talentSearch.paging.total', 'paging.total', 'total'],
+    'url_id': ['ciphertext', 'profile.ciphertext'],
+    'name': ['shortName', 'name'],
+    'title': ['title'],
+    'hourly_rate': ['hourlyRate.amount', 'rate.amount'],
+    'job_success': ['jobSuccessScore'],
+    'earnings': ['totalEarnings', 'earnings'],
+    'total_jobs': ['totalJobs', 'totalJobsWorked'],
+    'skills': ['skills'],
+}
+
+
+def apply_capture_options(options):
+    """Turns on the performance log the network events are read from."""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def enable_capture(driver):
+    """Enables the CDP network domain the response bodies are read through."""
+    driver.execute_cdp_cmd('Network.enable', {})
+
+
+def find_path(payloads, chain):
+    """
+    Returns the value at the first dotted key path of a chain found in any payload.
+
+    Args:
+        payloads (list): Decoded JSON documents, searched in order
+        chain (list[str]): Dotted key paths, e.g. 'profile.stats.totalHours'
+
+    Returns:
+        The value, or None when no path matches
+    """
+    for path in chain:
+        for payload in payloads:
+            value = payload
+            for key in path.split('.'):
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                if value is not None:
+                    return value
+    return None
+
+
+def _item(item, name):
+    return find_path([item], ITEM_PATHS[name]) if isinstance(item, dict) else None
+
+
+def _number(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _count(value):
+    """Whole number of a numeric value or of text starting with one, like '3 days', as the DOM extractors read it."""
+    if isinstance(value, str):
+        match = re.match(r'\s*(\d+(?:\.\d+)?)', value)
+        value = match.group(1) if match else None
+    number = _number(value)
+    return int(number) if number is not None else None
+
+
+def _lower(value):
+    return value.lower() if isinstance(value, str) else None
+
+
+def profile_sections(payloads):
+    """
+    Maps captured profile payloads into the sections of the output schema.
+
+    Args:
+        payloads (list): Decoded profile API responses
+
+    Returns:
+        dict: Only the sections the payloads hold, keyed like ProfileScraper.EXTRACTORS
+    """
+    field = lambda name: find_path(payloads, PROFILE_PATHS[name])
+    sections = {}
+
+    if field('name') is not None:
+        total_jobs, total_hours = _number(field('total_jobs')), _number(field('total_hours'))
+        sections['basic_info'] = {
+            'name': field('name'),
+            'title': field('title'),
+            'description': field('description'),
+            'job_success': _number(field('job_success')) or None,
+            'total_jobs': int(total_jobs) if total_jobs is not None else None,
+            'total_hours': int(total_hours) if total_hours is not None else None,
+        }
+    if field('hours_per_week') is not None or field('response_time') is not None:
+        sections['availability'] = {
+            'hours_per_week': field('hours_per_week'),
+            'response_time': field('response_time'),
+            'contract_to_hire': bool(field('contract_to_hire')),
+        }
+    if field('hourly_rate') is not None:
+        sections['offer_details'] = {
+            'hourly_rate': _number(field('hourly_rate')),
+            'title': field('title'),
+            'description': field('description'),
+        }
+    if field('consultation_rate') is not None:
+        duration = _number(field('consultation_duration'))
+        sections['consultation_rate'] = {
+            'rate': _number(field('consultation_rate')),
+            'duration': int(duration) if duration is not None else None,
+            'type': field('consultation_type'),
+        }
+
+    # Lists come as the API sent them, including entries the page truncates or folds away
+    work_history = field('work_history')
+    if isinstance(work_history, list):
+        sections['work_history'] = [
+            {
+                'title': _item(job, 'job_title'),
+                'rating': _number(_item(job, 'job_rating')),
+                'dates': {'start': _item(job, 'job_start'), 'end': _item(job, 'job_end')},
+                'feedback': _item(job, 'job_feedback'),
+            }
+            for job in work_history
+        ]
+    skills = field('skills')
+    if isinstance(skills, list):
+        sections['skills'] = {'categories': {}, 'other_skills': []}
+        for skill in skills:
+            name = skill if isinstance(skill, str) else _item(skill, 'skill_name')
+            group = None if isinstance(skill, str) else _item(skill, 'skill_group')
+            if not name:
+                continue
+            if group:
+                sections['skills']['categories'].setdefault(group, []).append(name)
+            else:
+                sections['skills']['other_skills'].append(name)
+    projects = field('project_catalog')
+    if isinstance(projects, list):
+        sections['project_catalog'] = [
+            {
+                'title': _item(project, 'project_title'),
+                'price': {
+                    'amount': _number(_item(project, 'project_price')),
+                    'type': _lower(_item(project, 'project_price_type')),
+                },
+                'delivery': {
+                    'duration': _count(_item(project, 'project_delivery')),
+                    'unit': _lower(_item(project, 'project_delivery_unit')),
+                },
+            }
+            for project in projects
+        ]
+    testimonials = field('testimonials')
+    if isinstance(testimonials, list):
+        sections['testimonials'] = [
+            {
+                'text': _item(testimonial, 'testimonial_text'),
+                'author': {
+                    'name': _item(testimonial, 'testimonial_author'),
+                    'position': _item(testimonial, 'testimonial_position'),
+                },
+                'date': _item(testimonial, 'testimonial_date'),
+                'verified': bool(_item(testimonial, 'testimonial_verified')),
+            }
+            for testimonial in testimonials
+        ]
+    return sections
+
+
+def search_results(payloads, page_url):
+    """
+    Maps captured search payloads into profile URLs and search card summaries.
+
+    Args:
+        payloads (list): Decoded search API responses
+        page_url (str): URL of the search page, profile URLs are resolved against it
+
+    Returns:
+        tuple: (list of (profile_url, card) in result order, total result count or None),
+            or (None, None) when the payloads hold no result list
+    """
+    results = find_path(payloads, SEARCH_PATHS['results'])
+    if not isinstance(results, list):
+        return None, None
+
+    cards = []
+    for result in results:
+        field = lambda name: find_path([result], SEARCH_PATHS[name]) if isinstance(result, dict) else None
+        url_id = field('url_id')
+        if not url_id:
+            continue
+        total_jobs = _number(field('total_jobs'))
+        skills = field('skills') or []
+        cards.append((urljoin(page_url, f"/freelancers/{url_id}"), {
+            'name': field('name'),
+            'title': field('title'),
+            'hourly_rate': _number(field('hourly_rate')),
+            'job_success': _number(field('job_success')),
+            'earnings': field('earnings'),
+            'total_jobs': int(total_jobs) if total_jobs is not None else None,
+            'skills': [
+                skill if isinstance(skill, str) else _item(skill, 'skill_name')
+                for skill in skills if skill
+            ],
+        }))
+    return cards, _number(find_path(payloads, SEARCH_PATHS['total']))
+
+
+class PayloadCapture:
+    """
+    Collects the JSON response bodies a page loads, from Chrome's performance
+    log, so the data can be read as the app received it instead of scraped
+    back out of the rendered markup. One per driver.
+    """
+    # Seconds between two reads of the performance log
+    POLL_INTERVAL = 0.1
+    # Seconds without a new matching request after which the page is done loading
+    # its data, e.g. the later pages of a paginated work history
+    QUIET_WINDOW = 0.5
+
+    def __init__(self, driver):
+        """
+        Args:
+            driver: Chrome driver started with apply_capture_options, then enable_capture
+        """
+        self.driver = driver
+
+    def clear(self):
+        """Drops the events logged so far, e.g. before a navigation."""
+        self.driver.get_log('performance')
+
+    def collect(self, pattern, timeout, container=None):
+        """
+        Waits for the JSON responses whose URL matches a pattern.
+        Returns once no matching response is still loading and no matching request
+        showed up for QUIET_WINDOW seconds, provided a payload arrived or the page
+        is ready (its container is present, or the document finished loading);
+        at the latest after the timeout, which only a pending response waits out.
+
+        Args:
+            pattern (re.Pattern): Pattern of the API URLs to keep
+            timeout (float): Seconds to wait at most
+            container (str): Optional class name of the element the page's content lives in
+
+        Returns:
+            list: Decoded response bodies, in arrival order
+        """
+        deadline = time.monotonic() + timeout
+        payloads = []
+        pending = {}
+        last_activity = time.monotonic()
+        while True:
+            for entry in self.driver.get_log('performance'):
+                if self._read_entry(entry, pattern, pending, payloads):
+                    last_activity = time.monotonic()
+            now = time.monotonic()
+            if not pending and now - last_activity >= self.QUIET_WINDOW and (payloads or self._page_ready(container)):
+                return payloads
+            if now >= deadline:
+                return payloads
+            time.sleep(self.POLL_INTERVAL)
+
+    def _page_ready(self, container):
+        """Checks whether the page shows its container or finished loading, so no API response is coming."""
+        try:
+            if container and self.driver.find_elements('class name', container):
+                return True
+            return self.driver.execute_script('return document.readyState') == 'complete'
+        except Exception:
+            return False
+
+    def _read_entry(self, entry, pattern, pending, payloads):
+        """Reads one performance log entry; returns True if it concerns a matching response."""
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            return False
+        params = message.get('params', {})
+        if message.get('method') == 'Network.responseReceived':
+            response = params.get('response', {})
+            if 'json' in response.get('mimeType', '') and pattern.search(response.get('url', '')):
+                pending[params.get('requestId')] = response['url']
+                return True
+        elif message.get('method') == 'Network.loadingFinished' and params.get('requestId') in pending:
+            url = pending.pop(params['requestId'])
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': params['requestId']})
+                text = base64.b64decode(body['body']) if body.get('base64Encoded') else body['body']
+                payloads.append(json.loads(text))
+            except Exception as e:
+                logging.debug(f"Could not read the response body of {url}: {e}")
+            return True
+        return False
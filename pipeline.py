@@ -0,0 +1,170 @@
+import queue
+import threading
+import time
+import logging
+
+
+class PageTracker:
+    """
+    Collects the profile results of one search page as they land,
+    keeping them in page order.
+    """
+    def __init__(self, page, profile_urls):
+        self.page = page
+        self.profile_urls = profile_urls
+        self.results = [None] * len(profile_urls)
+        self.remaining = len(profile_urls)
+
+    def page_results(self):
+        """Returns the successful profile results in page order."""
+        return [result for result in self.results if result is not None]
+
+
+class PagePipeline:
+    """
+    Producer/consumer crawl: a producer thread walks the search pages ahead
+    of the profile workers, so pagination and page_delay overlap with
+    profile scraping instead of adding to it.
+    """
+    def __init__(self, page_scraper, pool, config, lookup_profile=None, record_profile=None, filter_profiles=None,
+                 defer_failure=None):
+        """
+        Args:
+            page_scraper: PageScraper with its own driver, used only by the producer
+            pool: Started BrowserPool scraping the profiles
+            config: ScraperConfig instance
+            lookup_profile (callable): Optional, returns known data for a URL instead of scraping it
+            record_profile (callable): Optional, called with (url, data) for each scraped profile
+            filter_profiles (callable): Optional, narrows each page's profile URLs before scraping
+            defer_failure (callable): Optional, called with (error, page, profile_url=None, elapsed=None)
+                for each failed page or profile instead of logging it
+        """
+        self.page_scraper = page_scraper
+        self.pool = pool
+        self.config = config
+        self.lookup_profile = lookup_profile
+        self.record_profile = record_profile
+        self.filter_profiles = filter_profiles
+        self.defer_failure = defer_failure
+        # Pages fetched but not yet fully scraped: the one in progress plus the lookahead
+        self.pages_in_flight = threading.Semaphore(config.prefetch_pages + 1)
+        self.fetched_pages = queue.Queue(maxsize=config.prefetch_pages)
+        self.stop_event = threading.Event()
+        # Guards page completion; notified once a page's callback has run
+        self.page_done = threading.Condition()
+
+    def run(self, base_url, pages, on_page_complete=None):
+        """
+        Scrapes search pages and their profiles.
+
+        Args:
+            base_url (str): The base URL of the search
+            pages (list[int]): Page numbers to scrape
+            on_page_complete (callable): Called with (page_results, page_number)
+                as soon as the last profile of a page lands
+
+        Returns:
+            list[dict]: Profile data, in page order
+        """
+        producer = threading.Thread(
+            target=self._produce,
+            args=(base_url, pages),
+            name='page-producer',
+            daemon=True
+        )
+        producer.start()
+
+        trackers = []
+        try:
+            while True:
+                tracker = self.fetched_pages.get()
+                if tracker is None:
+                    break
+                trackers.append(tracker)
+
+                if not tracker.profile_urls:
+                    self.pages_in_flight.release()
+                    continue
+
+                for index, profile_url in enumerate(tracker.profile_urls):
+                    known_data = self.lookup_profile(profile_url) if self.lookup_profile else None
+                    if known_data is not None:
+                        self._complete_profile(tracker, index, known_data, on_page_complete)
+                        continue
+                    future = self.pool.submit(profile_url)
+                    future.add_done_callback(
+                        lambda f, t=tracker, i=index: self._on_profile_done(f, t, i, on_page_complete)
+                    )
+
+            with self.page_done:
+                self.page_done.wait_for(lambda: all(not t.remaining for t in trackers))
+        finally:
+            self.stop_event.set()
+            # Unblock the producer if it is waiting for room, then drain it out
+            self.pages_in_flight.release()
+            while producer.is_alive():
+                try:
+                    self.fetched_pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+        return [result for tracker in trackers for result in tracker.page_results()]
+
+    def _produce(self, base_url, pages):
+        try:
+            for page in pages:
+                self.pages_in_flight.acquire()
+                if self.stop_event.is_set() or not self.page_scraper.wants_page(page):
+                    return
+
+                logging.info(f"[INFO] Scraping page {page}")
+                try:
+                    profile_urls = self.page_scraper.extract_profile_links(base_url, page)
+                    if self.filter_profiles:
+                        profile_urls = self.filter_profiles(profile_urls)
+                except Exception as e:
+                    if self.defer_failure:
+                        self.defer_failure(e, page)
+                    else:
+                        logging.error(f"Error scraping page {page}: {e}")
+                    profile_urls = []
+
+                self.fetched_pages.put(PageTracker(page, profile_urls))
+
+                # Delay between pages, now overlapped with profile scraping
+                if page != pages[-1] and not self.config.target_rpm and self.page_scraper.wants_page(page + 1):
+                    time.sleep(self.config.page_delay)
+        finally:
+            self.fetched_pages.put(None)
+
+    def _on_profile_done(self, future, tracker, index, on_page_complete):
+        profile_url = tracker.profile_urls[index]
+        profile_data = None
+        try:
+            profile_data = future.result()
+            profile_data['profile_url'] = profile_url
+            if self.record_profile:
+                self.record_profile(profile_url, profile_data)
+        except Exception as e:
+            if self.defer_failure:
+                self.defer_failure(e, tracker.page, profile_url)
+            else:
+                logging.error(f"Error scraping profile {profile_url}: {e}")
+
+        self._complete_profile(tracker, index, profile_data, on_page_complete)
+
+    def _complete_profile(self, tracker, index, profile_data, on_page_complete):
+        with self.page_done:
+            tracker.results[index] = profile_data
+            if tracker.remaining > 1:
+                tracker.remaining -= 1
+                return
+            page_results = tracker.page_results()
+            if on_page_complete and page_results:
+                try:
+                    on_page_complete(page_results, tracker.page)
+                except Exception as e:
+                    logging.error(f"Error in page callback for page {tracker.page}: {e}")
+            tracker.remaining = 0
+            self.pages_in_flight.release()
+            self.page_done.notify_all()
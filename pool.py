@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import time
+import logging
+from retry import record_attempt_time
+
+
+class BrowserWorker:
+    """
+    A single browser in the pool: one Chrome driver and its ProfileScraper.
+    Restarts its own driver when it dies so the rest of the run is unaffected.
+    """
+    def __init__(self, worker_id, create_profile_scraper, config):
+        """
+        Args:
+            worker_id (int): Index of the worker, used in logs
+            create_profile_scraper (callable): Called with the worker id, returns a ProfileScraper
+                bound to a fresh driver
+            config: ScraperConfig instance
+        """
+        self.worker_id = worker_id
+        self.create_profile_scraper = create_profile_scraper
+        self.config = config
+        self.profile_scraper = None
+
+    def start(self):
+        """Starts the worker's driver."""
+        self.profile_scraper = self.create_profile_scraper(self.worker_id)
+
+    def stop(self):
+        """Quits the worker's driver, ignoring errors from an already dead browser."""
+        if self.profile_scraper:
+            try:
+                self.profile_scraper.driver.quit()
+            except Exception:
+                pass
+            self.profile_scraper = None
+
+    def restart(self):
+        """Replaces the worker's driver with a fresh one."""
+        logging.warning(f"[POOL] Restarting worker {self.worker_id}")
+        self.stop()
+        self.start()
+
+    def is_alive(self):
+        """Checks whether the driver still answers commands."""
+        try:
+            self.profile_scraper.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def scrape(self, profile_url, browser_only=False):
+        """
+        Scrapes a profile, restarting the driver if the failure killed it.
+
+        Args:
+            profile_url (str): URL of the profile to scrape
+            browser_only (bool): As in ProfileScraper.scrape_profile
+
+        Returns:
+            dict: Profile data as returned by ProfileScraper.scrape_profile
+        """
+        try:
+            return self.profile_scraper.scrape_profile(profile_url, browser_only)
+        except Exception:
+            if not self.is_alive():
+                self.profile_scraper.metrics.increment('driver_restarts')
+                self.restart()
+            raise
+
+
+class BrowserPool:
+    """
+    Pool of independent browsers that scrape profiles in parallel.
+    Each URL is handed to whichever worker is free.
+    """
+    def __init__(self, create_profile_scraper, config, size):
+        """
+        Args:
+            create_profile_scraper (callable): Called with a worker id, returns a ProfileScraper
+                bound to a fresh driver
+            config: ScraperConfig instance
+            size (int): Number of browsers to run
+        """
+        self.config = config
+        self.size = size
+        self.workers = [
+            BrowserWorker(worker_id, create_profile_scraper, config)
+            for worker_id in range(size)
+        ]
+        self.idle_workers = queue.Queue()
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Starts every worker's driver, one at a time since driver patching is not concurrency safe."""
+        for worker in self.workers:
+            worker.start()
+            self.idle_workers.put(worker)
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='browser')
+
+    def stop(self):
+        """Stops the executor and every driver."""
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        for worker in self.workers:
+            worker.stop()
+
+    def submit(self, profile_url, browser_only=False):
+        """
+        Queues one profile for the next free worker.
+
+        Args:
+            profile_url (str): URL of the profile to scrape
+            browser_only (bool): As in ProfileScraper.scrape_profile
+
+        Returns:
+            Future: Resolves to the profile data, or raises the scraping error
+        """
+        return self.executor.submit(self._run, profile_url, browser_only)
+
+    def scrape_profiles(self, profile_urls):
+        """
+        Scrapes profiles in parallel.
+
+        Args:
+            profile_urls (list[str]): URLs to scrape
+
+        Returns:
+            list[tuple]: (profile_url, profile_data, error) in the order of profile_urls
+        """
+        futures = [(url, self.submit(url)) for url in profile_urls]
+        results = []
+        for url, future in futures:
+            try:
+                results.append((url, future.result(), None))
+            except Exception as e:
+                results.append((url, None, e))
+        return results
+
+    def _run(self, profile_url, browser_only=False):
+        worker = self.idle_workers.get()
+        if worker is None:
+            # Sentinel left by the last retired worker, pass it on to other waiters
+            self.idle_workers.put(None)
+            raise RuntimeError("All browser workers have failed")
+        started_at = time.monotonic()
+        try:
+            logging.info(f"[INFO] Worker {worker.worker_id} scraping profile {profile_url}")
+            return worker.scrape(profile_url, browser_only)
+        except Exception as e:
+            # Charged to the profile's retry time budget when the failure is deferred
+            record_attempt_time(e, time.monotonic() - started_at)
+            # A worker whose restart failed is dropped instead of returned to the pool
+            if worker.profile_scraper is None:
+                self._retire(worker)
+                worker = None
+            raise
+        finally:
+            if worker is not None:
+                # Per-browser politeness delay, unless the rate controller paces requests
+                if not self.config.target_rpm:
+                    time.sleep(self.config.profile_delay)
+                self.idle_workers.put(worker)
+
+    def _retire(self, worker):
+        with self.lock:
+            logging.error(f"[POOL] Worker {worker.worker_id} could not be restarted, removing it")
+            self.workers.remove(worker)
+            if not self.workers:
+                self.idle_workers.put(None)
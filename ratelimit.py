@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+import asyncio
+import threading
+import time
+import logging
+from http_fetch import ChallengePageError
+
+
+class RateController:
+    """
+    Token bucket shared by every browser of a run, with an AIMD rate:
+    the rate grows additively while requests succeed quickly and is cut
+    multiplicatively on errors, challenge pages or slow responses.
+    Replaces the fixed profile_delay/page_delay sleeps when enabled.
+    """
+    # Additive increase, in requests per minute, after each fast success
+    INCREASE_STEP = 1.0
+    # Multiplicative decrease on an error or a challenge page
+    ERROR_BACKOFF = 0.5
+    # Gentler decrease when a request succeeds but slower than latency_target
+    SLOW_BACKOFF = 0.8
+    # Concurrent failures within this window only count as one decrease
+    DECREASE_COOLDOWN = 5.0
+
+    def __init__(self, target_rpm, min_rpm=1.0, latency_target=10.0, burst=1):
+        """
+        Args:
+            target_rpm (float): Highest rate allowed, in requests per minute
+            min_rpm (float): Rate floor after repeated backoffs
+            latency_target (float): Seconds above which a request counts as a slowdown
+            burst (int): Tokens that can be spent at once, e.g. one per browser
+        """
+        self.max_rate = target_rpm
+        self.min_rate = min(min_rpm, target_rpm)
+        # Slow start halfway to the target, the additive increase finds the rest
+        self.rate = max(self.min_rate, target_rpm / 2)
+        self.latency_target = latency_target
+        self.burst = burst
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.last_decrease = 0.0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.challenges = 0
+
+    @property
+    def current_rate(self):
+        """Current allowed rate, in requests per minute."""
+        return self.rate
+
+    def acquire(self):
+        """Blocks until the bucket allows one more request."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * 60 / self.rate
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Same as acquire, waiting on the event loop instead of blocking the thread."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * 60 / self.rate
+            await asyncio.sleep(wait)
+
+    def record(self, latency, error=False, challenge=False):
+        """
+        Feeds the outcome of one request back into the rate.
+
+        Args:
+            latency (float): Seconds the request took
+            error (bool): The request failed
+            challenge (bool): The site answered with an anti-bot challenge
+        """
+        with self.lock:
+            self.requests += 1
+            if challenge:
+                self.challenges += 1
+                self._decrease(self.ERROR_BACKOFF)
+            elif error:
+                self.errors += 1
+                self._decrease(self.ERROR_BACKOFF)
+            elif latency > self.latency_target:
+                self._decrease(self.SLOW_BACKOFF)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.INCREASE_STEP)
+
+    @contextmanager
+    def throttle(self):
+        """Waits for a token, then records the latency and outcome of the wrapped request."""
+        self.acquire()
+        with self.measure():
+            yield
+
+    @contextmanager
+    def measure(self):
+        """Records the latency and outcome of a request whose token was already taken."""
+        started_at = time.monotonic()
+        try:
+            yield
+        except ChallengePageError:
+            self.record(time.monotonic() - started_at, challenge=True)
+            raise
+        except Exception:
+            self.record(time.monotonic() - started_at, error=True)
+            raise
+        self.record(time.monotonic() - started_at)
+
+    def summary(self):
+        return (
+            f"Rate controller: {self.rate:.1f} req/min, {self.requests} requests, "
+            f"{self.errors} errors, {self.challenges} challenges"
+        )
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate / 60)
+        self.updated_at = now
+
+    def _decrease(self, factor):
+        now = time.monotonic()
+        if now - self.last_decrease < self.DECREASE_COOLDOWN:
+            return
+        self.last_decrease = now
+        self.rate = max(self.min_rate, self.rate * factor)
+        logging.info(f"[RATE] Backing off to {self.rate:.1f} req/min")
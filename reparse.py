@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import logging
+from archive import HtmlArchive
+from snapshot import PageSnapshot
+
+# Per-process state of the reparse workers, set up once by _init_worker
+_archive = None
+_extractor = None
+
+
+def _init_worker(archive_dir, config):
+    global _archive, _extractor
+    from scraper import ProfileScraper
+
+    _archive = HtmlArchive(archive_dir)
+    _extractor = ProfileScraper(None, config)
+
+
+def _reparse_page(entry):
+    profile_url, digest = entry
+    try:
+        profile_data = _extractor.extract_profile(PageSnapshot(_archive.get(digest)))
+    except Exception as e:
+        return profile_url, None, f"{type(e).__name__}: {e}"
+    profile_data['profile_url'] = profile_url
+    return profile_url, profile_data, None
+
+
+def reparse_archive(archive_dir, config, sink, processes=None, chunksize=64):
+    """
+    Re-runs the profile extractors over every archived profile page, in
+    parallel across cores, and writes the results into a sink.
+
+    Args:
+        archive_dir (str): HtmlArchive directory
+        config: ScraperConfig the extractors are built with
+        sink (ProfileSink): Writer receiving the profiles, in archive order
+        processes (int): Worker processes (default: one per core)
+        chunksize (int): Pages handed to a worker at once
+
+    Returns:
+        int: Number of pages that could not be parsed
+    """
+    entries = list(HtmlArchive(archive_dir).entries().items())
+    processes = processes or os.cpu_count() or 1
+    logging.info(f"[INFO] Reparsing {len(entries)} archived profiles with {processes} processes")
+
+    failures = 0
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(archive_dir, config)) as executor:
+        for profile_url, profile_data, error in executor.map(_reparse_page, entries, chunksize=chunksize):
+            if error:
+                failures += 1
+                logging.error(f"Error reparsing profile {profile_url}: {error}")
+                continue
+            sink.write(profile_data)
+    return failures
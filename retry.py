@@ -0,0 +1,195 @@
+import threading
+import time
+import logging
+from http_fetch import ChallengePageError
+
+# Failure classes; the first three are transient and retried at the end of the run
+TIMEOUT = 'timeout'
+CHALLENGE = 'challenge'
+DRIVER_DEAD = 'driver_dead'
+MISSING_CONTAINER = 'missing_container'
+OTHER = 'other'
+RETRYABLE = (TIMEOUT, CHALLENGE, DRIVER_DEAD)
+
+# Errors of a browser or chromedriver that is gone, by exception name and message
+DRIVER_DEAD_ERRORS = ('InvalidSessionIdException', 'NoSuchWindowException', 'MaxRetryError', 'ConnectionRefusedError')
+DRIVER_DEAD_MARKERS = ('chrome not reachable', 'disconnected', 'session deleted', 'no such window', 'target window already closed',
+                       'invalid session id', 'connection refused', 'all browser workers have failed')
+
+
+class MissingContainerError(Exception):
+    """Raised when a page finished loading without the element its content lives in."""
+
+
+def record_attempt_time(error, seconds):
+    """Attaches the duration of a failed attempt to its error, for an engine deferring it from another thread."""
+    error.attempt_seconds = seconds
+
+
+def classify_failure(error):
+    """
+    Tells what kind of failure an exception from a page or profile scrape is.
+
+    Returns:
+        str: TIMEOUT, CHALLENGE, DRIVER_DEAD, MISSING_CONTAINER or OTHER
+    """
+    if isinstance(error, ChallengePageError):
+        return CHALLENGE
+    if isinstance(error, MissingContainerError):
+        return MISSING_CONTAINER
+    name = type(error).__name__
+    message = str(error).lower()
+    if name in DRIVER_DEAD_ERRORS or any(marker in message for marker in DRIVER_DEAD_MARKERS):
+        return DRIVER_DEAD
+    if isinstance(error, TimeoutError) or 'Timeout' in name:
+        return TIMEOUT
+    if name == 'NoSuchElementException':
+        return MISSING_CONTAINER
+    return OTHER
+
+
+class DeferredTask:
+    """A search page or profile that failed, waiting for its next attempt."""
+    def __init__(self, page, profile_url, category, elapsed):
+        self.page = page
+        self.profile_url = profile_url
+        self.category = category
+        self.attempts = 1
+        # Seconds spent on the timed attempts, against the time budget
+        self.elapsed = elapsed
+
+    def __str__(self):
+        return f"profile {self.profile_url}" if self.profile_url else f"page {self.page}"
+
+
+class RetryQueue:
+    """
+    Keeps the pages and profiles that failed on a transient error (timeout,
+    challenge page, dead driver) instead of dropping them, and retries them
+    once the crawl is done: in rounds, after an exponentially growing delay,
+    until they succeed, run out of attempts or exceed their time budget.
+    Failures that a retry would not fix (missing content container, parse
+    errors) are counted and dropped right away.
+    """
+    def __init__(self, config, metrics):
+        """
+        Args:
+            config: ScraperConfig instance
+            metrics (Metrics): Stage timers and counters of the run
+        """
+        self.config = config
+        self.metrics = metrics
+        self.lock = threading.Lock()
+        self.pending = []
+        self.succeeded = 0
+        self.recovered = 0
+        # Failure class -> pages and profiles given up on
+        self.failed_pages = {}
+        self.failed_profiles = {}
+
+    def record_success(self):
+        """Counts a profile done, scraped or taken from the journal, cache or search card, for the run summary."""
+        with self.lock:
+            self.succeeded += 1
+
+    def defer(self, error, page, profile_url=None, elapsed=None):
+        """
+        Queues a failed page or profile for a retry at the end of the run, if its failure is transient.
+
+        Args:
+            error (Exception): The failure
+            page (int): Search page, of the profile for profile failures
+            profile_url (str): URL of the failed profile, None for a page failure
+            elapsed (float): Seconds the failed attempt took, by default the time
+                attached to the error with record_attempt_time, if any
+        """
+        if elapsed is None:
+            elapsed = getattr(error, 'attempt_seconds', 0.0)
+        self._requeue(DeferredTask(page, profile_url, classify_failure(error), elapsed), error)
+
+    def drain(self, retry_page, retry_profile, revive_driver):
+        """
+        Retries the deferred pages and profiles in rounds, with a backoff before each.
+
+        Args:
+            retry_page (callable): Called with a page number, scrapes it again
+            retry_profile (callable): Called with (profile_url, page), scrapes it again
+            revive_driver (callable): Restarts the retrying browser if it is dead; called
+                before each dead-driver retry, which is given up if it raises
+        """
+        delay = self.config.retry_base_delay
+        round_number = 0
+        while self.pending:
+            round_number += 1
+            with self.lock:
+                tasks, self.pending = self.pending, []
+            logging.info(f"[RETRY] Round {round_number}: retrying {len(tasks)} failures in {delay:.0f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, self.config.retry_max_delay)
+
+            revive_error = None
+            for task in tasks:
+                if task.category == DRIVER_DEAD:
+                    # An earlier retry of the round may have killed the browser again
+                    if revive_error is None:
+                        try:
+                            revive_driver()
+                        except Exception as e:
+                            revive_error = e
+                    if revive_error is not None:
+                        self._give_up(task, 'the browser could not be restarted', revive_error)
+                        continue
+
+                started_at = time.monotonic()
+                try:
+                    if task.profile_url:
+                        retry_profile(task.profile_url, task.page)
+                    else:
+                        retry_page(task.page)
+                except Exception as e:
+                    task.elapsed += time.monotonic() - started_at
+                    task.attempts += 1
+                    task.category = classify_failure(e)
+                    self._requeue(task, e)
+                    continue
+                self.metrics.increment('retry_successes')
+                if task.profile_url:
+                    with self.lock:
+                        self.recovered += 1
+                logging.info(f"[RETRY] Recovered {task} after {task.attempts} failed attempts")
+
+    def summary(self):
+        failed_profiles = sum(self.failed_profiles.values())
+        failed_pages = sum(self.failed_pages.values())
+        breakdown = lambda failed: ", ".join(f"{category}: {count}" for category, count in sorted(failed.items()))
+        text = f"Run summary: {self.succeeded} profiles done ({self.recovered} recovered on retry), {failed_profiles} failed"
+        if failed_profiles:
+            text += f" ({breakdown(self.failed_profiles)})"
+        text += f", {failed_pages} pages failed"
+        if failed_pages:
+            text += f" ({breakdown(self.failed_pages)})"
+        return text
+
+    def _requeue(self, task, error):
+        config = self.config
+        reason = None
+        if task.category not in RETRYABLE:
+            reason = 'not retryable'
+        elif task.attempts > config.retry_max_attempts:
+            reason = f"{task.attempts} failed attempts"
+        elif task.profile_url and config.profile_time_budget and task.elapsed >= config.profile_time_budget:
+            reason = f"time budget of {config.profile_time_budget:.0f}s spent"
+
+        self.metrics.increment(f'failures_{task.category}')
+        if reason is None:
+            logging.warning(f"[RETRY] Deferring {task} ({task.category}): {error}")
+            with self.lock:
+                self.pending.append(task)
+        else:
+            self._give_up(task, reason, error)
+
+    def _give_up(self, task, reason, error):
+        logging.error(f"Error scraping {task} ({task.category}, {reason}): {error}")
+        with self.lock:
+            failed = self.failed_profiles if task.profile_url else self.failed_pages
+            failed[task.category] = failed.get(task.category, 0) + 1
@@ -1,16 +1,167 @@
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+# undetected_chromedriver and selenium are imported where a browser is started or
+# waited on, so offline users of this module (extraction, reparsing) do not load them
+from contextlib import contextmanager, nullcontext
+from dataclasses import replace
+import asyncio
+import math
 import os
+import re
+import socket
 import time
+import threading
+from urllib.parse import urljoin
+import hashlib
 import logging
+from snapshot import PageSnapshot
+from pool import BrowserPool
+from pipeline import PagePipeline
+from async_engine import AsyncEngine
+from coordinator import QueueWorker
+from retry import RetryQueue, MissingContainerError
+from http_fetch import HttpFetcher, FetchStats, ChallengePageError, is_challenge_page
+from cache import ProfileCache, canonical_profile_url
+from journal import CrawlJournal
+from ratelimit import RateController
+from lean import apply_lean_options, enable_lean_mode, log_page_metrics
+from selector_registry import SelectorRegistry
+from metrics import Metrics, MetricsWriter, NULL_METRICS
+from warmstart import WarmStart
+from archive import HtmlArchive
+from watchdog import ManagedDriver, report_result
+from payloads import (
+    PayloadCapture, apply_capture_options, enable_capture, profile_sections, search_results,
+    PROFILE_API_PATTERN, SEARCH_API_PATTERN
+)
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(message)s'
 )
 
+# Fallback chains used by the extractors, in default order; the registry reorders
+# them by recent success rate. Entries starting with '//' are XPath, others CSS.
+SELECTOR_CHAINS = {
+    'profile_links': ["a.profile-link"],
+    'search_cards': ["div.up-card-section", "article[data-test='FreelancerTile']"],
+    'card_rate': ["[data-test='rate-per-hour']"],
+    'card_job_success': ["[data-test='job-success-score']"],
+    'card_earnings': ["[data-test='earned-amount-formatted']"],
+    'card_jobs': ["[data-test='total-jobs']"],
+    'card_name': ["[data-test='freelancer-name']", "a.profile-link"],
+    'card_title': ["[data-test='freelancer-title']", "h4.title"],
+    'card_skills': ["[data-test='token'] span", "span.air3-token"],
+    'result_count': ["[data-test='results-count']", "span.results-count"],
+    'pagination_pages': ["nav[data-test='pagination'] li", "ul.pagination li"],
+    'name': ["h2[itemprop='name']"],
+    'title': ["div.d-flex.align-items-center.justify-space-between h2.mb-0"],
+    'description': ["div.text-body.text-light-on-inverse span.text-pre-line"],
+    'job_success': [
+        "div.is-animated span[data-v-1a549d04]:first-child",
+        "span[data-test='job-success-score'] span",
+        "div.up-skill-badge span:first-child"
+    ],
+    'stats': [
+        "div.stat-amount.h5 span",  # New version
+        "div.flex-grow-1 h4",       # Old version
+        "[class*='stat'] span:first-child"  # Generic fallback
+    ],
+    'hourly_rate': ["h3.h5.nowrap span"],
+    'offer_title': ["h2.mb-0.pt-lg-2x.h4"],
+    'consultation_rate': ["p.m-0.text-light-on-muted"],
+    'job_items': ["div.assignments-item.assignments-item-hoverable"],
+    'job_title': ["h5.align-items-center.mb-2x"],
+    'job_rating': ["strong.text-body-sm"],
+    'job_dates': ["span.text-base-sm.text-stone"],
+    'job_feedback': ["span.air3-truncation span[tabindex='-1'] span[id^='air3-truncation-']"],
+    'hours_per_week': ["//*[contains(text(), 'hrs/week')]"],
+    'response_time': ["//*[contains(text(), 'response time')]"],
+    'contract_to_hire': ["//*[contains(text(), 'contract to hire')]"],
+    'skill_categories': ["[data-v-6bddd6fe]"],
+    'skill_category_title': ["h3.skills-group-list-title"],
+    'skill_name': ["span.skill-name"],
+    'other_skills': ["[data-v-3dfc0d73]"],
+    'project_items': ["section[data-v-404f92c0] div.pp-hover"],
+    'project_title': ["h4.mb-0.mt-0"],
+    'project_price': ["div.air3-token.product-price-start"],
+    'project_delivery': ["div.delivery-days"],
+    'testimonial_items': ["section.testimonial-item"],
+    'testimonial_text': ["p.mb-6x"],
+    'testimonial_author': ["p.text-base"],
+    'testimonial_author_name': ["strong"],
+    'testimonial_date': ["span.vertical-align-middle.pr-3x"],
+    'testimonial_verified': ["span.text-light-on-inverse"],
+}
+
+# Chains whose element many profiles legitimately lack, so their misses say
+# nothing about the layout and never trigger a [SELECTORS] warning
+OPTIONAL_CHAINS = (
+    'job_success', 'consultation_rate', 'job_rating', 'job_feedback',
+    'contract_to_hire', 'other_skills', 'testimonial_verified',
+)
+
+def wait_for_element(driver, timeout, class_name):
+    """
+    Waits for an element of the given class, telling a challenge page
+    apart from a plain timeout.
+    
+    Raises:
+        ChallengePageError: The site served an anti-bot challenge instead
+        MissingContainerError: The page finished loading without the element
+        TimeoutException: The element did not appear in time
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CLASS_NAME, class_name))
+        )
+    except TimeoutException:
+        if is_challenge_page(driver.page_source):
+            raise ChallengePageError(f"Challenge page instead of {class_name} at {driver.current_url}")
+        if driver.execute_script('return document.readyState') == 'complete':
+            raise MissingContainerError(f"No {class_name} in the loaded page at {driver.current_url}")
+        raise
+
+# Search-card fields whose change means the profile is worth fetching again
+CARD_FINGERPRINT_CHAINS = ('card_rate', 'card_job_success', 'card_earnings', 'card_jobs')
+
+def _parse_number(text):
+    """Parses the first number of a displayed value, e.g. 40.0 from '$40.00/hr' or 1200 from '1,200 jobs'."""
+    match = re.search(r'\d[\d,]*(?:\.\d+)?', text or '')
+    return float(match.group().replace(',', '')) if match else None
+
+def search_url(config, keyword):
+    """Returns the base URL of a keyword's talent search, to which the page number is appended."""
+    return f"{config.base_url}/nx/search/talent/?nbs=1&q={keyword}"
+
+def _has_content(section):
+    """Checks whether an extracted section holds anything, e.g. not a dict of Nones or an empty list."""
+    if isinstance(section, dict):
+        return any(_has_content(value) for value in section.values())
+    return bool(section)
+
+class CrawlRun:
+    """What an engine needs to scrape the remaining pages of one keyword."""
+    def __init__(self, base_url, pages, page_complete, results_by_page, sink):
+        self.base_url = base_url
+        self.pages = pages
+        self.page_complete = page_complete
+        self.results_by_page = results_by_page
+        self.sink = sink
+    
+    def results(self):
+        """
+        Returns:
+            list[dict]: Profiles in page order, or None when streaming into a sink or nothing was found
+        """
+        if self.sink:
+            return None
+        profiles_data = [profile for page in sorted(self.results_by_page) for profile in self.results_by_page[page]]
+        return profiles_data if profiles_data else None
+
 class Scraper:
     """
     Main class that orchestrates the scraping process.
@@ -18,80 +169,432 @@ class Scraper:
     """
     def __init__(self, config):
         self.config = config
-        self.options = uc.ChromeOptions()
+        self.driver = None
+        self.page_scraper = None
+        self.profile_scraper = None
+        self.extractor = None
+        self.pool = None
+        self.fetch_stats = FetchStats()
+        self.selectors = SelectorRegistry(SELECTOR_CHAINS, config.selector_stats_path, OPTIONAL_CHAINS)
+        self.rate_controller = None
+        if config.target_rpm:
+            self.rate_controller = RateController(
+                config.target_rpm,
+                config.min_rpm,
+                config.page_load_timeout / 2,
+                max(1, config.workers)
+            )
+        self.journal = None
+        self.sink = None
+        self.keyword = None
+        # Canonical profile URL -> keywords that matched it, for deduplication within a run
+        self.seen_profiles = None
+        # seen_profiles of the last scrape_keywords run, kept for keyword_matches
+        self.last_keyword_matches = {}
+        self.seen_lock = threading.Lock()
+        self.batch = False
+        self.cache = None
+        if config.cache_path:
+            self.cache = ProfileCache(config.cache_path, config.cache_max_age_hours, config.cache_max_entries)
+        # Instrumentation is a no-op unless a metrics file is configured
+        self.metrics = Metrics() if config.metrics_path else NULL_METRICS
+        self.metrics_writer = None
+        self.warm_start = WarmStart(config.warm_start_dir, config.chrome_path) if config.warm_start else None
+        self.archive = HtmlArchive(config.archive_dir) if config.archive_dir else None
+        # Canonical profile URL -> fingerprint of its latest search card, for incremental refresh
+        self.card_fingerprints = None
+        if config.incremental:
+            if self.cache:
+                self.card_fingerprints = {}
+            else:
+                logging.warning("Incremental refresh needs a profile cache (SCRAPER_CACHE_PATH), ignoring it")
+        # Canonical profile URL -> its latest search card summary, in shallow mode
+        self.search_cards = {} if config.shallow else None
+        self.card_only_profiles = 0
+        self.deep_profiles = 0
+        # Profiles visited in shallow mode because no search card was read for them
+        self.cardless_profiles = 0
+        # Failures of the current keyword's crawl, retried once its pages are done
+        self.retries = None
+    
+    def _build_options(self):
+        """Builds a fresh ChromeOptions object (uc refuses to reuse one across drivers)."""
+        import undetected_chromedriver as uc
         
-        if config.headless:
-            self.options.add_argument('--headless')
+        options = uc.ChromeOptions()
+        
+        if self.config.headless:
+            options.add_argument('--headless')
             # Options nécessaires pour le mode headless
-            self.options.add_argument('--no-sandbox')
-            self.options.add_argument('--disable-gpu')
-            self.options.add_argument('--disable-dev-shm-usage')
-            self.options.add_argument('--window-size=1920,1080')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument('--window-size=1920,1080')
             # User agent Chrome standard
-            self.options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36')
+            options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36')
             
-        if config.chrome_path and os.path.exists(config.chrome_path):
-            self.options.binary_location = config.chrome_path
+        if self.config.chrome_path and os.path.exists(self.config.chrome_path):
+            options.binary_location = self.config.chrome_path
+        
+        if self.config.lean_mode:
+            apply_lean_options(options)
+        
+        if self.config.capture_payloads:
+            apply_capture_options(options)
             
-        self.driver = None
-        self.page_scraper = None
-        self.profile_scraper = None
+        return options
+    
+    def _create_driver(self, profile_name='main'):
+        """
+        Starts a new Chrome driver and logs how long it took.
+        
+        Args:
+            profile_name (str): Persistent profile of the browser in warm-start mode
+        """
+        import undetected_chromedriver as uc
+        
+        started_at = time.monotonic()
+        if self.warm_start:
+            driver, warm = self.warm_start.create_driver(self._build_options(), profile_name)
+        else:
+            driver, warm = uc.Chrome(options=self._build_options()), False
+        if self.config.lean_mode:
+            enable_lean_mode(driver)
+        if self.config.capture_payloads:
+            enable_capture(driver)
+        
+        elapsed = time.monotonic() - started_at
+        self.metrics.observe('driver_start', elapsed)
+        logging.info(f"[INFO] Chrome '{profile_name}' started in {elapsed:.1f}s ({'warm' if warm else 'cold'} start)")
+        return driver
+    
+    def _start_browser(self, profile_name='main'):
+        """Starts a driver, under the watchdog when enabled."""
+        if self.config.watchdog:
+            return ManagedDriver(lambda: self._create_driver(profile_name), self.config, self.metrics, profile_name)
+        return self._create_driver(profile_name)
     
     def start(self):
         """Initializes the Chrome driver and scraping components."""
-        self.driver = uc.Chrome(options=self.options)
-        self.page_scraper = PageScraper(self.driver, self.config)
-        self.profile_scraper = ProfileScraper(self.driver, self.config)
+        if self.config.metrics_path:
+            self.metrics_writer = MetricsWriter(self.metrics, self.config.metrics_path, self.config.metrics_interval)
+            self.metrics_writer.start()
+        
+        self.driver = self._start_browser()
+        self.page_scraper = PageScraper(
+            self.driver, self.config, self.rate_controller, self.selectors, self.metrics,
+            self.card_fingerprints, self.search_cards
+        )
+        self.profile_scraper = ProfileScraper(
+            self.driver, self.config, self.fetch_stats, self.rate_controller, self.selectors,
+            self.metrics, self.archive
+        )
+        if self.config.async_engine:
+            # Parses pages fetched by the async engine, on the event loop
+            self.extractor = ProfileScraper(
+                None, replace(self.config, http_fast_path=False),
+                selectors=self.selectors, metrics=self.metrics, archive=self.archive
+            )
+        
+        # Prefetching needs the main driver for search pages, so profiles go through the pool
+        if self.config.workers > 1 or self.config.prefetch_pages:
+            self.pool = BrowserPool(
+                lambda worker_id: ProfileScraper(
+                    self._start_browser(f'worker-{worker_id}'), self.config, self.fetch_stats,
+                    self.rate_controller, self.selectors, self.metrics, self.archive
+                ),
+                self.config,
+                self.config.workers
+            )
+            self.pool.start()
     
     def stop(self):
         """Stops the Chrome driver and cleans up resources."""
+        if self.pool:
+            self.pool.stop()
+            self.pool = None
         if self.driver:
             self.driver.quit()
+        if self.cache:
+            self.cache.close()
+            self.cache = None
+        if self.metrics_writer:
+            self.metrics_writer.stop()
+            self.metrics_writer = None
+        if self.archive:
+            self.archive.close()
     
-    def scrape_upwork(self, keyword, num_pages, on_page_complete=None):
+    def scrape_upwork(self, keyword, num_pages, on_page_complete=None, sink=None):
         """
         Orchestrates the scraping of Upwork search results.
+        With async_engine enabled this is a blocking wrapper around scrape_upwork_async,
+        so it must not be called from a running event loop.
         
         Args:
             keyword (str): The keyword to search for on Upwork
-            num_pages (int): Number of pages to scrape
+            num_pages (int or str): Number of pages to scrape, or 'auto' for every page
+                of the search up to auto_max_pages; the crawl stops early on its own once
+                the result count, an empty page or a repeated page shows nothing is left
             on_page_complete (callable): Optional callback function called after each page
                 with (page_results, page_number) as arguments
+            sink (ProfileSink): Optional writer each profile is pushed into as soon as
+                it is available; profiles are then not accumulated in memory
                 
         Returns:
-            list[dict]: List of profile data
+            list[dict]: List of profile data, or None when streaming into a sink
         """
-        if not self.driver:
-            self.start()
-            
+        if self.config.async_engine:
+            return asyncio.run(self.scrape_upwork_async(keyword, num_pages, on_page_complete, sink))
+        
+        with self._crawl(keyword, num_pages, on_page_complete, sink) as crawl:
+            if not crawl.pages:
+                pass
+            elif self.config.prefetch_pages:
+                pipeline = PagePipeline(
+                    self.page_scraper, self.pool, self.config,
+                    self._lookup_profile, self._record_profile, self._claim_new_profiles, self.retries.defer
+                )
+                pipeline.run(crawl.base_url, crawl.pages, crawl.page_complete)
+            else:
+                self._scrape_pages(crawl.base_url, crawl.pages, crawl.page_complete)
+            self._retry_failures(crawl)
+        
+        return crawl.results()
+    
+    async def scrape_upwork_async(self, keyword, num_pages, on_page_complete=None, sink=None, fetcher=None):
+        """
+        Same as scrape_upwork, but search pages and profiles are fetched as asyncio
+        tasks, at most async_concurrency at once and paced by the rate controller.
+        Pages the fetch layer cannot serve (challenges, client-rendered content)
+        fall back to the browsers.
+        
+        Args:
+            fetcher: Optional fetch layer with a coroutine fetch(url, marker) returning
+                (HTML or None, failure), and a close() method; defaults to HTTP requests
+                using the browser's cookies
+            Other arguments as in scrape_upwork
+                
+        Returns:
+            list[dict]: List of profile data, or None when streaming into a sink
+        """
+        with self._crawl(keyword, num_pages, on_page_complete, sink) as crawl:
+            if crawl.pages:
+                engine = AsyncEngine(
+                    self.page_scraper, self.profile_scraper, self.extractor, self.pool, self.config,
+                    self.fetch_stats, fetcher,
+                    self._lookup_profile, self._record_profile, self._claim_new_profiles, self.retries.defer
+                )
+                await engine.run(crawl.base_url, crawl.pages, crawl.page_complete)
+            # Retries run in the browser, off the event loop
+            await asyncio.to_thread(self._retry_failures, crawl)
+        
+        return crawl.results()
+    
+    @contextmanager
+    def _crawl(self, keyword, num_pages, on_page_complete, sink):
+        """
+        Sets up one keyword's crawl (journal, restored pages, deduplication, sink)
+        around the engine that scrapes its remaining pages, and tears it down after.
+        
+        Yields:
+            CrawlRun: Pages left to scrape and the callback to call as each completes
+        """
+        base_url = search_url(self.config, keyword)
+        if num_pages == 'auto':
+            num_pages = self.config.auto_max_pages
+        self.keyword = keyword
+        # Standalone calls deduplicate across their own pages; scrape_keywords spans keywords
+        owns_seen_profiles = self.seen_profiles is None
+        if owns_seen_profiles:
+            self.seen_profiles = {}
+        
+        if self.config.journal_dir:
+            self.journal = CrawlJournal.for_keyword(self.config.journal_dir, keyword, self.config.resume)
+        
+        # Pages finished by an earlier, interrupted run are not visited again
+        restored_pages = {
+            page: page_results
+            for page, page_results in (self.journal.completed_pages() if self.journal else {}).items()
+            if page <= num_pages
+        }
+        pages = [page for page in range(1, num_pages + 1) if page not in restored_pages]
+        for page_results in restored_pages.values():
+            self._claim_new_profiles([profile_data['profile_url'] for profile_data in page_results])
+        
+        self.sink = sink
+        if sink:
+            for page in sorted(restored_pages):
+                for profile_data in restored_pages[page]:
+                    sink.write(profile_data)
+            results_by_page = {}
+        else:
+            results_by_page = restored_pages
+        
+        # Profiles recovered by a retry complete their page a second time, adding to it
+        def page_complete(page_results, page):
+            if sink:
+                sink.flush()
+            else:
+                results_by_page.setdefault(page, []).extend(page_results)
+            if self.journal:
+                self.journal.record_page(
+                    page, self.journal.pages.get(page, []) + [profile['profile_url'] for profile in page_results]
+                )
+            if on_page_complete:
+                on_page_complete(page_results, page)
+        
+        try:
+            if pages and not self.driver:
+                self.start()
+            if self.page_scraper:
+                self.page_scraper.reset_pagination()
+            self.retries = RetryQueue(self.config, self.metrics)
+            yield CrawlRun(base_url, pages, page_complete, results_by_page, sink)
+        finally:
+            self.selectors.save()
+            self.sink = None
+            retries, self.retries = self.retries, None
+            if owns_seen_profiles:
+                self.seen_profiles = None
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+        
+        if retries and pages:
+            logging.info(f"[RETRY] {retries.summary()}")
+        self._log_summaries()
+    
+    def _log_summaries(self):
+        """Logs the counters of the fetch layer, cache, rate controller, archive and shallow mode."""
+        if self.config.http_fast_path or self.config.async_engine:
+            logging.info(f"[INFO] {self.fetch_stats.summary()}")
+        if self.cache:
+            logging.info(f"[INFO] {self.cache.summary()}")
+        if self.rate_controller:
+            logging.info(f"[INFO] {self.rate_controller.summary()}")
+        if self.archive:
+            logging.info(f"[INFO] {self.archive.summary()}")
+        if self.search_cards is not None:
+            logging.info(
+                f"[INFO] Shallow mode: {self.card_only_profiles} profiles from their search card, "
+                f"{self.deep_profiles} visited ({self.cardless_profiles} without a card)"
+            )
+    
+    def scrape_keywords(self, keywords, num_pages, on_page_complete=None, sink=None):
+        """
+        Scrapes several keywords with the same browsers, scraping each profile once.
+        A profile found again under another keyword is not re-scraped; the keyword
+        is added to its 'keywords' list instead.
+        
+        Args:
+            keywords (list[str]): Keywords to search for, in order
+            num_pages (int): Number of pages to scrape per keyword
+            on_page_complete (callable): Optional callback called after each page
+                with (page_results, page_number, keyword) as arguments
+            sink (ProfileSink): Optional writer profiles are streamed into
+                
+        Returns:
+            list[dict]: Unique profiles across all keywords, or None when streaming into a sink
+        """
+        self.seen_profiles = {}
+        self.batch = True
         profiles_data = []
-        base_url = f"https://www.upwork.com/nx/search/talent/?nbs=1&q={keyword}"
         
-        for page in range(1, num_pages + 1):
+        try:
+            for keyword in keywords:
+                logging.info(f"[INFO] Scraping keyword '{keyword}'")
+                callback = None
+                if on_page_complete:
+                    callback = lambda page_results, page, keyword=keyword: on_page_complete(page_results, page, keyword)
+                keyword_results = self.scrape_upwork(keyword, num_pages, callback, sink)
+                profiles_data.extend(keyword_results or [])
+            
+            duplicates = sum(len(matched) - 1 for matched in self.seen_profiles.values())
+            logging.info(
+                f"[INFO] {len(self.seen_profiles)} unique profiles across {len(keywords)} keywords, "
+                f"{duplicates} cross-keyword duplicates skipped"
+            )
+        finally:
+            # Later scrape_upwork calls must not deduplicate against this run
+            self.last_keyword_matches = self.seen_profiles
+            self.seen_profiles = None
+            self.batch = False
+        
+        if sink:
+            return None
+        return profiles_data if profiles_data else None
+    
+    def work(self, queue, worker_id=None, sink=None):
+        """
+        Runs as one worker of a distributed crawl: claims search page and profile
+        tasks from a shared queue, filled with the enqueue command, until no task
+        is left. Profiles are deduplicated by the queue across all workers and
+        keywords, and streamed into this worker's own sink.
+        
+        Args:
+            queue (WorkQueue): Queue shared by the workers
+            worker_id (str): Optional unique worker name, defaults to host-pid
+            sink (ProfileSink): Optional writer the worker's profiles are streamed into
+            
+        Returns:
+            int: Number of tasks this worker completed
+        """
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        logging.info(f"[QUEUE] Worker {worker_id} starting, {queue.summary()}")
+        self.sink = sink
+        try:
+            if not self.driver:
+                self.start()
+            worker = QueueWorker(
+                self.page_scraper, self.profile_scraper, queue, self.config, worker_id,
+                lambda keyword: search_url(self.config, keyword),
+                self._lookup_profile, self._record_profile, self.search_cards, self.card_fingerprints,
+                (lambda task: sink.flush()) if sink else None
+            )
+            worker.run()
+        finally:
+            self.selectors.save()
+            self.sink = None
+        
+        logging.info(
+            f"[QUEUE] Worker {worker_id} done: {worker.tasks_done} tasks completed, "
+            f"{worker.tasks_failed} failed; {queue.summary()}"
+        )
+        self._log_summaries()
+        return worker.tasks_done
+    
+    def keyword_matches(self):
+        """
+        Returns:
+            dict: Canonical profile URL -> keywords that matched it, for the last scrape_keywords run
+        """
+        return dict(self.last_keyword_matches)
+    
+    def _scrape_pages(self, base_url, pages, on_page_complete):
+        """
+        Scrapes search pages one after another, then their profiles.
+        
+        Args:
+            base_url (str): The base URL of the search
+            pages (list[int]): Page numbers to scrape
+            on_page_complete (callable): Called with (page_results, page_number)
+        """
+        for page in pages:
+            if not self.page_scraper.wants_page(page):
+                break
             logging.info(f"[INFO] Scraping page {page}")
-            page_results = []
             
             try:
                 # Get profile URLs from current page
-                profiles = self.page_scraper.extract_profile_links(base_url, page)
+                try:
+                    profile_urls = self.page_scraper.extract_profile_links(base_url, page)
+                except Exception as e:
+                    self.retries.defer(e, page)
+                    continue
+                profiles = self._claim_new_profiles(profile_urls)
                 
                 # Scrape each profile
-                for profile_url in profiles:
-                    try:
-                        logging.info(f"[INFO] Scraping profile {profile_url}")
-                        profile_data = self.profile_scraper.scrape_profile(profile_url)
-                        logging.info(f"  - Completed")
-                        
-                        profile_data['profile_url'] = profile_url
-                        profiles_data.append(profile_data)
-                        page_results.append(profile_data)
-                        
-                        # Delay between profiles
-                        time.sleep(self.config.profile_delay)
-                        
-                    except Exception as e:
-                        logging.error(f"Error scraping profile {profile_url}: {e}")
-                        continue
+                page_results = self._scrape_profiles(profiles, page)
                 
                 # Call callback with page results if provided
                 if on_page_complete and page_results:
@@ -102,24 +605,270 @@ class Scraper:
                 continue
             
             finally:
-                # Delay between pages (even if there was an error)
-                if page < num_pages:
+                # Delay between pages (even if there was an error), unless the rate controller paces requests
+                if page != pages[-1] and not self.rate_controller and self.page_scraper.wants_page(page + 1):
                     time.sleep(self.config.page_delay)
+    
+    def _scrape_profiles(self, profile_urls, page):
+        """
+        Scrapes the profiles of one search page, through the pool when enabled.
+        Profiles failing on a transient error are deferred to the retry queue.
         
-        return profiles_data if profiles_data else None
+        Args:
+            profile_urls (list[str]): URLs of the profiles to scrape
+            page (int): Search page the profiles are on
+            
+        Returns:
+            list[dict]: Profile data of the successful scrapes, in page order
+        """
+        page_results = []
+        
+        if self.pool:
+            known = {url: self._lookup_profile(url) for url in profile_urls}
+            scraped = {
+                url: (profile_data, error) for url, profile_data, error
+                in self.pool.scrape_profiles([url for url in profile_urls if known[url] is None])
+            }
+            for profile_url in profile_urls:
+                if known[profile_url] is not None:
+                    page_results.append(known[profile_url])
+                    continue
+                profile_data, error = scraped[profile_url]
+                if error:
+                    self.retries.defer(error, page, profile_url)
+                    continue
+                profile_data['profile_url'] = profile_url
+                self._record_profile(profile_url, profile_data)
+                page_results.append(profile_data)
+            return page_results
+        
+        for profile_url in profile_urls:
+            known_data = self._lookup_profile(profile_url)
+            if known_data is not None:
+                page_results.append(known_data)
+                continue
+            
+            started_at = time.monotonic()
+            try:
+                logging.info(f"[INFO] Scraping profile {profile_url}")
+                profile_data = self.profile_scraper.scrape_profile(profile_url)
+                logging.info(f"  - Completed")
+                
+                profile_data['profile_url'] = profile_url
+                self._record_profile(profile_url, profile_data)
+                page_results.append(profile_data)
+                
+                # Delay between profiles, unless the rate controller paces requests
+                if not self.rate_controller:
+                    time.sleep(self.config.profile_delay)
+                
+            except Exception as e:
+                self.retries.defer(e, page, profile_url, time.monotonic() - started_at)
+                continue
+        
+        return page_results
+    
+    def _retry_failures(self, crawl):
+        """
+        Drains the retry queue of the crawl in the main browser, once every page was tried.
+        Retried pages complete as usual; recovered profiles complete their page again.
+        """
+        recovered = {}
+        
+        def retry_page(page):
+            profile_urls = self.page_scraper.extract_profile_links(crawl.base_url, page)
+            page_results = self._scrape_profiles(self._claim_new_profiles(profile_urls), page)
+            if page_results:
+                crawl.page_complete(page_results, page)
+        
+        def retry_profile(profile_url, page):
+            try:
+                profile_data = self.profile_scraper.scrape_profile(profile_url)
+            finally:
+                if not self.rate_controller:
+                    time.sleep(self.config.profile_delay)
+            profile_data['profile_url'] = profile_url
+            self._record_profile(profile_url, profile_data)
+            recovered.setdefault(page, []).append(profile_data)
+        
+        self.retries.drain(retry_page, retry_profile, self._revive_browser)
+        for page in sorted(recovered):
+            crawl.page_complete(recovered[page], page)
+    
+    def _revive_browser(self):
+        """Restarts the main browser if it died, so retries of dead-driver failures get a live one."""
+        try:
+            self.driver.current_url
+            return
+        except Exception:
+            pass
+        logging.warning("[RETRY] The main browser is gone, restarting it")
+        self.metrics.increment('driver_restarts')
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self._start_browser()
+        self.page_scraper.set_driver(self.driver)
+        self.profile_scraper.set_driver(self.driver)
+    
+    def _claim_new_profiles(self, profile_urls):
+        """
+        Drops profiles already seen earlier in the run (on another page or, in batch
+        mode, under another keyword) and records the current keyword as matching them.
+        
+        Returns:
+            list[str]: The profile URLs not seen before, in page order
+        """
+        new_urls = []
+        with self.seen_lock:
+            for profile_url in profile_urls:
+                matched = self.seen_profiles.setdefault(canonical_profile_url(profile_url), [])
+                if not matched:
+                    new_urls.append(profile_url)
+                if self.keyword not in matched:
+                    matched.append(self.keyword)
+        return new_urls
+    
+    def _tag_keywords(self, profile_data):
+        """In batch mode, attaches the shared list of keywords matching the profile."""
+        if self.batch:
+            profile_data['keywords'] = self.seen_profiles[canonical_profile_url(profile_data['profile_url'])]
+    
+    def _lookup_profile(self, profile_url):
+        """
+        Returns profile data already in the journal or the cache, or a card-only record
+        in shallow mode, else None. In shallow mode, a profile whose search card could
+        not be read is visited rather than output without data.
+        """
+        profile_data = self.journal.get_profile(profile_url) if self.journal else None
+        if profile_data is not None:
+            self._tag_keywords(profile_data)
+            self._emit(profile_data)
+            return profile_data
+        
+        if self.search_cards is not None:
+            card = self.search_cards.get(canonical_profile_url(profile_url))
+            if card is None:
+                logging.warning(f"No search card for {profile_url}, visiting the profile instead")
+                with self.seen_lock:
+                    self.cardless_profiles += 1
+            elif not self._wants_deep_visit(card):
+                profile_data = {'profile_url': profile_url, 'card': card}
+                self._tag_keywords(profile_data)
+                if self.journal:
+                    self.journal.record_profile(profile_url, profile_data)
+                self._emit(profile_data)
+                with self.seen_lock:
+                    self.card_only_profiles += 1
+                return profile_data
+        
+        if not self.cache:
+            return None
+        profile_data = self.cache.get(profile_url, self._card_fingerprint(profile_url))
+        if profile_data is not None:
+            logging.info(f"[INFO] Using cached profile {profile_url}")
+            profile_data['profile_url'] = profile_url
+            self._tag_keywords(profile_data)
+            if self.journal:
+                self.journal.record_profile(profile_url, profile_data)
+            self._emit(profile_data)
+        return profile_data
+    
+    def _record_profile(self, profile_url, profile_data):
+        """Journals, caches and streams out freshly scraped profile data."""
+        self._tag_keywords(profile_data)
+        if self.search_cards is not None:
+            profile_data['card'] = self.search_cards.get(canonical_profile_url(profile_url))
+            with self.seen_lock:
+                self.deep_profiles += 1
+        if self.journal:
+            self.journal.record_profile(profile_url, profile_data)
+        if self.cache:
+            self.cache.put(profile_url, profile_data, self._card_fingerprint(profile_url))
+        self._emit(profile_data)
+    
+    def _wants_deep_visit(self, card):
+        """
+        Applies the shallow mode filter to a search card. Without a filter no
+        profile is visited; with one, cards missing a filtered field are not either.
+        """
+        bounds = [
+            ('job_success', self.config.deep_min_job_success, None),
+            ('hourly_rate', self.config.deep_min_rate, self.config.deep_max_rate),
+        ]
+        if not card or all(low is None and high is None for _, low, high in bounds):
+            return False
+        for field, low, high in bounds:
+            if low is None and high is None:
+                continue
+            value = card.get(field)
+            if value is None or (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
+    
+    def _card_fingerprint(self, profile_url):
+        """Returns the fingerprint of the profile's search card seen in this run, if any."""
+        if self.card_fingerprints is None:
+            return None
+        return self.card_fingerprints.get(canonical_profile_url(profile_url))
+    
+    def _emit(self, profile_data):
+        """Counts a finished profile and pushes it into the output sink, if streaming."""
+        if self.retries:
+            self.retries.record_success()
+        if self.sink:
+            self.sink.write(profile_data)
 
 class PageScraper:
     """
     Class responsible for scraping Upwork search result pages.
     Extracts information from the profile list on a given page.
     """
-    def __init__(self, driver, config):
+    def __init__(self, driver, config, rate_controller=None, selectors=None, metrics=None, fingerprints=None,
+                 cards=None):
         """
         Args:
             driver: Chrome driver instance to use for scraping
+            rate_controller (RateController): Optional pacing shared with the profile scrapers
+            selectors (SelectorRegistry): Optional registry shared with the profile scrapers
+            metrics (Metrics): Optional stage timers and counters shared with the profile scrapers
+            fingerprints (dict): Optional, filled with canonical profile URL -> search card fingerprint
+            cards (dict): Optional, filled with canonical profile URL -> search card summary
         """
         self.driver = driver
         self.config = config
+        self.rate_controller = rate_controller
+        self.selectors = selectors or SelectorRegistry(SELECTOR_CHAINS, optional=OPTIONAL_CHAINS)
+        self.metrics = metrics or NULL_METRICS
+        self.fingerprints = fingerprints
+        self.cards = cards
+        # Search payloads have no card text to fingerprint, incremental runs read the DOM
+        self.capture = None
+        if config.capture_payloads and driver is not None and fingerprints is None:
+            self.capture = PayloadCapture(driver)
+        self.pagination_lock = threading.Lock()
+        self.reset_pagination()
+    
+    def set_driver(self, driver):
+        """Switches to a fresh driver, e.g. after the previous browser died."""
+        self.driver = driver
+        if self.capture:
+            self.capture = PayloadCapture(driver)
+    
+    def reset_pagination(self):
+        """Forgets what was learned about the pages of the previous search."""
+        self.total_results = None
+        self.total_pages = None
+        # Last page that can hold new results, once known
+        self.last_page = None
+        self.stop_reason = None
+        # Set of profile URLs of each page seen -> the first page showing it
+        self.link_sets = {}
+    
+    def wants_page(self, page_number):
+        """Checks whether a page can still hold new results, given the page count and the pages seen so far."""
+        return self.last_page is None or page_number <= self.last_page
         
     def extract_profile_links(self, base_url, page_number):
         """
@@ -132,131 +881,430 @@ class PageScraper:
         Returns:
             list[str]: List of profile URLs found on the page
         """
+        if not self.wants_page(page_number):
+            return []
+        
         url = f"{base_url}&page={page_number}"
-        self.driver.get(url)
+        cards, total_results = None, None
+        try:
+            with self.rate_controller.throttle() if self.rate_controller else nullcontext():
+                if self.capture:
+                    self.capture.clear()
+                with self.metrics.timer('search_navigate'):
+                    self.driver.get(url)
+                
+                if self.capture:
+                    with self.metrics.timer('payload_wait'):
+                        cards, total_results = search_results(
+                            self.capture.collect(SEARCH_API_PATTERN, self.config.page_load_timeout, 'profiles-list'), url
+                        )
+                    if cards is None:
+                        self.metrics.increment('payload_fallbacks')
+                
+                if cards is None:
+                    # Wait with configured timeout
+                    with self.metrics.timer('search_wait'):
+                        wait_for_element(self.driver, self.config.page_load_timeout, "profiles-list")
+        except ChallengePageError:
+            self.metrics.increment('challenge_pages')
+            raise
+        except Exception:
+            self.metrics.increment('page_errors')
+            report_result(self.driver, False)
+            raise
+        report_result(self.driver, True)
         
-        # Wait with configured timeout
-        WebDriverWait(self.driver, self.config.page_load_timeout).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "profiles-list"))
-        )
+        if self.config.lean_mode:
+            log_page_metrics(self.driver, url)
+        
+        if cards is not None:
+            return self._payload_profile_links(cards, total_results, page_number)
+        
+        root = self.driver
+        if self.fingerprints is not None or self.cards is not None:
+            # One page_source round trip instead of several lookups per card
+            root = PageSnapshot.from_driver(self.driver)
+        return self.parse_profile_links(root, url, page_number)
+    
+    def parse_profile_links(self, root, page_url, page_number=None):
+        """
+        Extracts the unique profile URLs of a search page.
+        
+        Args:
+            root: The driver, or a PageSnapshot of a fetched search page
+            page_url (str): URL of the page, relative links are resolved against it
+            page_number (int): Optional page number, used to detect the end of the results
+            
+        Returns:
+            list[str]: List of profile URLs found on the page
+        """
+        if self.fingerprints is not None:
+            self._record_card_fingerprints(root, page_url)
+        if self.cards is not None:
+            with self.metrics.timer('extract_cards'):
+                for card in self.parse_cards(root, page_url):
+                    self.cards[canonical_profile_url(card.pop('profile_url'))] = card
         
         # Find all profile links
-        profile_links = self.driver.find_elements(By.CSS_SELECTOR, "a.profile-link")
+        with self.metrics.timer('extract_profile_links'):
+            profile_links = self.selectors.find_all(root, 'profile_links', default=[])
+        if not profile_links:
+            self.metrics.increment('empty_search_pages')
         
         # Extract and return unique profile URLs
         unique_urls = set()
         for link in profile_links:
             href = link.get_attribute('href')
             if href and '/freelancers/' in href:
-                unique_urls.add(href)
-                
+                unique_urls.add(urljoin(page_url, href))
+        
+        if page_number is not None:
+            self._track_pagination(root, page_number, unique_urls)
         return list(unique_urls)
+    
+    def _payload_profile_links(self, cards, total_results, page_number):
+        """Takes the profile URLs, and the cards in shallow mode, of a captured search payload."""
+        profile_urls = list(dict.fromkeys(profile_url for profile_url, _ in cards))
+        if self.cards is not None:
+            for profile_url, card in cards:
+                self.cards[canonical_profile_url(profile_url)] = card
+        if not profile_urls:
+            self.metrics.increment('empty_search_pages')
+        self._track_pagination(None, page_number, profile_urls, total_results)
+        return profile_urls
+    
+    def _track_pagination(self, root, page_number, profile_urls, total_results=None):
+        """
+        Narrows the pages worth visiting: to the page count the search shows,
+        and to the pages before the first empty page or repeat of an earlier page.
+        """
+        with self.pagination_lock:
+            if self.total_pages is None:
+                self._read_page_count(root, len(profile_urls), total_results)
+            
+            if not profile_urls:
+                self._stop_after(page_number - 1, f"page {page_number} is empty")
+                return
+            links = frozenset(profile_urls)
+            first_page = self.link_sets.setdefault(links, page_number)
+            if first_page != page_number:
+                self.link_sets[links] = min(first_page, page_number)
+                repeat = max(first_page, page_number)
+                self._stop_after(repeat - 1, f"page {repeat} repeats page {self.link_sets[links]}")
+    
+    def _read_page_count(self, root, page_size, total_results=None):
+        """
+        Reads the page count from the result count and page size, and from the
+        pagination. The pagination only shows a window of page numbers around the
+        current page, so the larger of the two estimates is kept.
+        Without a root (captured payloads), only the given result count is used.
+        """
+        self.total_results = total_results
+        page_numbers = []
+        if root is not None:
+            self.total_results = self.selectors.find(
+                root, 'result_count', parse=lambda element: _parse_number(element.text), default=None
+            )
+            page_numbers = self.selectors.find_all(
+                root, 'pagination_pages',
+                parse=lambda elements: [n for n in (_parse_number(e.text) for e in elements) if n],
+                default=[]
+            )
+        estimates = []
+        if self.total_results is not None and page_size:
+            estimates.append(math.ceil(self.total_results / page_size))
+        if page_numbers:
+            estimates.append(int(max(page_numbers)))
+        if estimates:
+            self.total_pages = max(estimates)
+        elif self.total_results == 0:
+            self.total_pages = 0
+        else:
+            return
+        
+        results = f"{int(self.total_results)} results" if self.total_results is not None else "unknown result count"
+        logging.info(f"[INFO] Search has {self.total_pages} pages ({results})")
+        self._stop_after(self.total_pages, f"the search has {self.total_pages} pages")
+    
+    def _stop_after(self, last_page, reason):
+        if self.last_page is not None and self.last_page <= last_page:
+            return
+        self.last_page = last_page
+        self.stop_reason = reason
+        logging.info(f"[INFO] Skipping the pages after page {last_page}: {reason}")
+    
+    def parse_cards(self, root, page_url):
+        """
+        Extracts the summary each search card shows, without visiting the profiles.
+        
+        Args:
+            root: The driver, or a PageSnapshot of a fetched search page
+            page_url (str): URL of the page, relative links are resolved against it
+            
+        Returns:
+            list[dict]: One record per card, with:
+                - profile_url: Absolute profile URL
+                - name, title: Strings, or None
+                - hourly_rate, job_success: Floats, or None
+                - earnings: Earnings as displayed (e.g. '$10K+ earned'), or None
+                - total_jobs: Integer, or None
+                - skills: List of skill names
+        """
+        text = lambda element: element.text.strip() or None
+        cards = []
+        for card in self.selectors.find_all(root, 'search_cards', default=[]):
+            href = self.selectors.find(
+                card, 'profile_links', parse=lambda link: link.get_attribute('href'), default=None
+            )
+            if not href:
+                continue
+            total_jobs = _parse_number(self.selectors.find(card, 'card_jobs', text, default=None))
+            cards.append({
+                'profile_url': urljoin(page_url, href),
+                'name': self.selectors.find(card, 'card_name', text, default=None),
+                'title': self.selectors.find(card, 'card_title', text, default=None),
+                'hourly_rate': _parse_number(self.selectors.find(card, 'card_rate', text, default=None)),
+                'job_success': _parse_number(self.selectors.find(card, 'card_job_success', text, default=None)),
+                'earnings': self.selectors.find(card, 'card_earnings', text, default=None),
+                'total_jobs': int(total_jobs) if total_jobs is not None else None,
+                'skills': [
+                    skill for skill in self.selectors.find_all(
+                        card, 'card_skills', lambda elements: [e.text.strip() for e in elements], default=[]
+                    ) if skill
+                ],
+            })
+        return cards
+    
+    def _record_card_fingerprints(self, root, page_url):
+        """
+        Fingerprints the fields of each search card (rate, job success, earnings,
+        job count), so unchanged profiles can be served from the cache.
+        Cards without any of these fields get no fingerprint and follow the cache TTL.
+        """
+        text = lambda element: element.text.strip()
+        for card in self.selectors.find_all(root, 'search_cards', default=[]):
+            href = self.selectors.find(
+                card, 'profile_links', parse=lambda link: link.get_attribute('href'), default=None
+            )
+            if not href:
+                continue
+            values = [self.selectors.find(card, chain, text, default='') for chain in CARD_FINGERPRINT_CHAINS]
+            if any(values):
+                digest = hashlib.sha1('|'.join(values).encode('utf-8')).hexdigest()[:16]
+                self.fingerprints[canonical_profile_url(urljoin(page_url, href))] = digest
 
 class ProfileScraper:
     """
     Class responsible for scraping individual profile pages.
     Extracts detailed information from Upwork freelancer profiles.
     """
-    def __init__(self, driver, config):
+    # Output section, extractor method and metrics stage of each part of a profile
+    EXTRACTORS = [
+        ('basic_info', '_extract_basic_info', 'extract_basic_info'),
+        ('availability', '_extract_availability_info', 'extract_availability_info'),
+        ('offer_details', '_extract_offer_details', 'extract_offer_details'),
+        ('consultation_rate', '_extract_consultation_rate', 'extract_consultation_rate'),
+        ('work_history', '_extract_work_history', 'extract_work_history'),
+        ('skills', '_extract_skills', 'extract_skills'),
+        ('project_catalog', '_extract_project_catalog', 'extract_project_catalog'),
+        ('testimonials', '_extract_testimonials', 'extract_testimonials'),
+    ]
+    
+    def __init__(self, driver, config, fetch_stats=None, rate_controller=None, selectors=None, metrics=None,
+                 archive=None):
         """
         Args:
             driver: Chrome driver instance to use for scraping
+            fetch_stats (FetchStats): Optional counters shared by the HTTP fast paths of a run
+            rate_controller (RateController): Optional pacing shared by every scraper of a run
+            selectors (SelectorRegistry): Optional registry shared by every scraper of a run
+            metrics (Metrics): Optional stage timers and counters shared by every scraper of a run
+            archive (HtmlArchive): Optional store every fetched profile page is saved into
         """
         self.driver = driver
         self.config = config
+        self.rate_controller = rate_controller
+        self.selectors = selectors or SelectorRegistry(SELECTOR_CHAINS, optional=OPTIONAL_CHAINS)
+        self.metrics = metrics or NULL_METRICS
+        self.archive = archive
+        self.http_fetcher = HttpFetcher(driver, config, fetch_stats) if config.http_fast_path else None
+        self.capture = PayloadCapture(driver) if config.capture_payloads and driver is not None else None
+        # Lookup root used by the _extract_* methods: a PageSnapshot or the live driver
+        self.root = driver
+
+    def set_driver(self, driver):
+        """Switches to a fresh driver, e.g. after the previous browser died."""
+        self.driver = driver
+        self.root = driver
+        if self.http_fetcher:
+            self.http_fetcher.driver = driver
+            self.http_fetcher.synced = False
+        if self.capture:
+            self.capture = PayloadCapture(driver)
 
-    def scrape_profile(self, profile_url):
+    def scrape_profile(self, profile_url, browser_only=False):
         """
         Main method to scrape all information from a profile page.
         
         Args:
             profile_url (str): URL of the profile to scrape
+            browser_only (bool): The caller already spent a rate limiter token and an
+                HTTP attempt on this profile: skip the HTTP fast path and only record
+                the navigation's outcome with the rate controller
             
         Returns:
             dict: All extracted profile information
         """
-        self.driver.get(profile_url)
+        if not self.rate_controller:
+            pacing = nullcontext()
+        elif browser_only:
+            pacing = self.rate_controller.measure()
+        else:
+            pacing = self.rate_controller.throttle()
+        try:
+            with pacing:
+                with self.metrics.timer('profile_total'):
+                    profile_data = self._scrape_profile(profile_url, use_http=not browser_only)
+        except ChallengePageError:
+            self.metrics.increment('challenge_pages')
+            raise
+        except Exception:
+            self.metrics.increment('profile_errors')
+            report_result(self.driver, False)
+            raise
+        report_result(self.driver, True)
+        return profile_data
+
+    def _scrape_profile(self, profile_url, use_http=True):
+        if self.http_fetcher and use_http:
+            with self.metrics.timer('http_fetch'):
+                html = self.http_fetcher.fetch(profile_url, 'profile-container')
+            if html:
+                return self.parse_profile(profile_url, html)
+            self.metrics.increment('http_fast_path_fallbacks')
+        
+        if self.capture:
+            self.capture.clear()
+        with self.metrics.timer('profile_navigate'):
+            self.driver.get(profile_url)
+        
+        if not self.capture:
+            return self._extract_loaded_profile(profile_url)
+        
+        # Sections the page's API responses hold are taken as is, the DOM only fills in the others
+        with self.metrics.timer('payload_wait'):
+            captured = profile_sections(
+                self.capture.collect(PROFILE_API_PATTERN, self.config.page_load_timeout, 'profile-container')
+            )
+        self.metrics.increment('payload_sections', len(captured))
+        missing = [section for section, _, _ in self.EXTRACTORS if section not in captured]
+        if not missing:
+            return {section: captured[section] for section, _, _ in self.EXTRACTORS}
         
+        self.metrics.increment('payload_fallbacks')
+        profile_data = self._extract_loaded_profile(profile_url, missing)
+        return {
+            section: captured[section] if section in captured else profile_data[section]
+            for section, _, _ in self.EXTRACTORS
+        }
+    
+    def _extract_loaded_profile(self, profile_url, sections=None):
+        """Waits for the profile page the driver navigated to, then extracts it from the DOM."""
         # Wait with configured timeout
-        WebDriverWait(self.driver, self.config.page_load_timeout).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "profile-container"))
-        )
+        with self.metrics.timer('profile_wait'):
+            wait_for_element(self.driver, self.config.page_load_timeout, "profile-container")
+        
+        if self.config.lean_mode:
+            log_page_metrics(self.driver, profile_url)
 
-        # Get all profile data
-        profile_data = {
-            'basic_info': self._extract_basic_info(),
-            'availability': self._extract_availability_info(),
-            'offer_details': self._extract_offer_details(),
-            'consultation_rate': self._extract_consultation_rate(),
-            'work_history': self._extract_work_history(),
-            'skills': self._extract_skills(),
-            'project_catalog': self._extract_project_catalog(),
-            'testimonials': self._extract_testimonials()
-        }
+        if self.config.snapshot_extraction:
+            try:
+                # One page_source round trip, then every selector runs offline
+                with self.metrics.timer('snapshot'):
+                    html = self.driver.page_source
+                return self.parse_profile(profile_url, html, sections)
+            except Exception as e:
+                self.metrics.increment('snapshot_fallbacks')
+                logging.warning(f"Snapshot extraction failed, falling back to live DOM: {e}")
+        elif self.archive:
+            self.archive.put(profile_url, self.driver.page_source)
+
+        return self.extract_profile(self.driver, sections)
+
+    def parse_profile(self, profile_url, html, sections=None):
+        """
+        Archives a fetched profile page if archiving is on, then extracts it offline.
+        
+        Args:
+            profile_url (str): URL the page was fetched from
+            html (str): The page HTML
+            sections (list[str]): Optional subset of the sections to extract
+            
+        Returns:
+            dict: All extracted profile information
+        """
+        if self.archive:
+            self.archive.put(profile_url, html)
+        return self.extract_profile(PageSnapshot(html), sections)
+
+    def extract_profile(self, root, sections=None):
+        """
+        Runs the extractors against a lookup root.
+        
+        Args:
+            root: A PageSnapshot, or the driver itself for live-DOM extraction
+            sections (list[str]): Optional subset of the sections to extract, default all
+            
+        Returns:
+            dict: All extracted profile information
+        """
+        self.root = root
+        profile_data = {}
+        for section, extractor, stage in self.EXTRACTORS:
+            if sections is not None and section not in sections:
+                continue
+            with self.metrics.timer(stage):
+                profile_data[section] = getattr(self, extractor)()
+            if not _has_content(profile_data[section]):
+                self.metrics.increment(f'empty_{section}')
         
         return profile_data
 
+    def _find(self, chain, root=None, parse=None, **kwargs):
+        """Looks up the first element of a selector chain, from root or the page."""
+        return self.selectors.find(self.root if root is None else root, chain, parse, **kwargs)
+
+    def _find_all(self, chain, root=None, parse=None, **kwargs):
+        """Looks up all elements of the first matching selector of a chain, from root or the page."""
+        return self.selectors.find_all(self.root if root is None else root, chain, parse, **kwargs)
+
     def _extract_basic_info(self):
         """
         Extracts basic profile information.
         """
         try:
             # Get name
-            name = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "h2[itemprop='name']"
-            ).text.strip()
+            name = self._find('name').text.strip()
             
             # Get title (specialized in...)
-            title = self.driver.find_element(
-                By.CSS_SELECTOR,
-                "div.d-flex.align-items-center.justify-space-between h2.mb-0"
-            ).text.strip()
+            title = self._find('title').text.strip()
             
             # Get description (the long text)
-            description = self.driver.find_element(
-                By.CSS_SELECTOR,
-                "div.text-body.text-light-on-inverse span.text-pre-line"
-            ).text.strip()
+            description = self._find('description').text.strip()
             
             # Get job success score with fallback selectors
-            job_success = None
-            job_success_selectors = [
-                "div.is-animated span[data-v-1a549d04]:first-child",
-                "span[data-test='job-success-score'] span",
-                "div.up-skill-badge span:first-child"
-            ]
-            
-            for selector in job_success_selectors:
-                try:
-                    job_success_text = self.driver.find_element(
-                        By.CSS_SELECTOR, 
-                        selector
-                    ).text.strip()
-                    job_success = float(job_success_text.replace('%', ''))
-                    if job_success:
-                        break
-                except:
-                    continue
+            job_success = self._find(
+                'job_success',
+                parse=lambda element: float(element.text.strip().replace('%', '')) or None,
+                default=None
+            )
             
             # Get total jobs and hours with fallback selectors
-            total_jobs = None
-            total_hours = None
-            stats_selectors = [
-                "div.stat-amount.h5 span",  # New version
-                "div.flex-grow-1 h4",       # Old version
-                "[class*='stat'] span:first-child"  # Generic fallback
-            ]
-            
-            for selector in stats_selectors:
-                try:
-                    stats = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if len(stats) >= 2:
-                        total_jobs = int(stats[0].text)
-                        total_hours = int(stats[1].text)
-                        break
-                except:
-                    continue
+            total_jobs, total_hours = self._find_all(
+                'stats',
+                parse=lambda stats: (int(stats[0].text), int(stats[1].text)),
+                default=(None, None)
+            )
             
             return {
                 'name': name,
@@ -289,23 +1337,14 @@ class ProfileScraper:
         """
         try:
             # Extract hourly rate
-            rate_element = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "h3.h5.nowrap span"
-            )
+            rate_element = self._find('hourly_rate')
             hourly_rate = float(rate_element.text.strip().replace('$', '').replace('/hr', ''))
             
             # Extract title
-            title = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "h2.mb-0.pt-lg-2x.h4"
-            ).text.strip()
+            title = self._find('offer_title').text.strip()
             
             # Extract description
-            description = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "div.text-body.text-light-on-inverse span.text-pre-line"
-            ).text.strip()
+            description = self._find('description').text.strip()
             
             return {
                 'hourly_rate': hourly_rate,
@@ -330,10 +1369,7 @@ class ProfileScraper:
                 - type: Type of consultation (e.g., 'Zoom meeting')
         """
         try:
-            rate_text = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "p.m-0.text-light-on-muted"
-            ).text.strip()
+            rate_text = self._find('consultation_rate').text.strip()
             
             # Parse "$30 per 30 min Zoom meeting"
             parts = rate_text.split()
@@ -368,34 +1404,23 @@ class ProfileScraper:
         
         try:
             # Find all job items
-            job_items = self.driver.find_elements(
-                By.CSS_SELECTOR, 
-                "div.assignments-item.assignments-item-hoverable"
-            )
+            job_items = self._find_all('job_items', default=[])
             
             for job in job_items:
                 try:
                     # Extract job title
-                    title = job.find_element(
-                        By.CSS_SELECTOR, 
-                        "h5.align-items-center.mb-2x"
-                    ).text.strip()
+                    title = self._find('job_title', job).text.strip()
                     
                     # Extract rating
-                    try:
-                        rating = float(job.find_element(
-                            By.CSS_SELECTOR, 
-                            "strong.text-body-sm"
-                        ).text.strip())
-                    except:
-                        rating = None
+                    rating = self._find(
+                        'job_rating', job,
+                        parse=lambda element: float(element.text.strip()),
+                        default=None
+                    )
                     
                     # Extract dates
                     try:
-                        dates_text = job.find_element(
-                            By.CSS_SELECTOR, 
-                            "span.text-base-sm.text-stone"
-                        ).text.strip()
+                        dates_text = self._find('job_dates', job).text.strip()
                         # Split "Feb 18, 2023 - Feb 21, 2023"
                         start_date, end_date = dates_text.split(" - ")
                     except:
@@ -403,13 +1428,11 @@ class ProfileScraper:
                         end_date = None
                     
                     # Extract feedback
-                    try:
-                        feedback = job.find_element(
-                            By.CSS_SELECTOR, 
-                            "span.air3-truncation span[tabindex='-1'] span[id^='air3-truncation-']"
-                        ).text.strip()
-                    except:
-                        feedback = None
+                    feedback = self._find(
+                        'job_feedback', job,
+                        parse=lambda element: element.text.strip(),
+                        default=None
+                    )
                     
                     jobs.append({
                         'title': title,
@@ -437,31 +1460,29 @@ class ProfileScraper:
         """
         try:
             # Find hours per week using text content directly
-            hours_elements = self.driver.find_elements(
-                By.XPATH,
-                "//*[contains(text(), 'hrs/week')]"
+            hours_section = self._find_all(
+                'hours_per_week',
+                parse=lambda elements: next(
+                    (el.text.strip() for el in elements if 'hrs/week' in el.text), None
+                ),
+                default=None
             )
-            hours_section = next((el.text.strip() for el in hours_elements if 'hrs/week' in el.text), None)
             
             # Get response time if available (using text content)
-            try:
-                response_elements = self.driver.find_elements(
-                    By.XPATH,
-                    "//*[contains(text(), 'response time')]"
-                )
-                response_time = next((el.text.strip() for el in response_elements if 'response time' in el.text), None)
-            except:
-                response_time = None
+            response_time = self._find_all(
+                'response_time',
+                parse=lambda elements: next(
+                    (el.text.strip() for el in elements if 'response time' in el.text), None
+                ),
+                default=None
+            )
             
             # Check if open to contract to hire (using text content)
-            try:
-                c2h_elements = self.driver.find_elements(
-                    By.XPATH,
-                    "//*[contains(text(), 'contract to hire')]"
-                )
-                contract_to_hire = any('Open to contract to hire' in el.text for el in c2h_elements)
-            except:
-                contract_to_hire = False
+            contract_to_hire = self._find_all(
+                'contract_to_hire',
+                parse=lambda elements: any('Open to contract to hire' in el.text for el in elements) or None,
+                default=False
+            )
             
             return {
                 'hours_per_week': hours_section,
@@ -492,23 +1513,14 @@ class ProfileScraper:
         
         try:
             # Get all skill categories
-            categories = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "[data-v-6bddd6fe]"
-            )
+            categories = self._find_all('skill_categories', default=[])
             
             for category in categories:
                 try:
-                    category_name = category.find_element(
-                        By.CSS_SELECTOR,
-                        "h3.skills-group-list-title"
-                    ).text.strip()
+                    category_name = self._find('skill_category_title', category).text.strip()
                     
                     category_skills = [
-                        skill.text.strip() for skill in category.find_elements(
-                            By.CSS_SELECTOR,
-                            "span.skill-name"
-                        )
+                        skill.text.strip() for skill in self._find_all('skill_name', category, default=[])
                     ]
                     
                     if category_skills:
@@ -518,15 +1530,9 @@ class ProfileScraper:
             
             # Get other skills
             try:
-                other_skills_section = self.driver.find_element(
-                    By.CSS_SELECTOR,
-                    "[data-v-3dfc0d73]"
-                )
+                other_skills_section = self._find('other_skills')
                 skills['other_skills'] = [
-                    skill.text.strip() for skill in other_skills_section.find_elements(
-                        By.CSS_SELECTOR,
-                        "span.skill-name"
-                    )
+                    skill.text.strip() for skill in self._find_all('skill_name', other_skills_section, default=[])
                 ]
             except:
                 pass
@@ -554,24 +1560,15 @@ class ProfileScraper:
         
         try:
             # Find all project items
-            project_items = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "section[data-v-404f92c0] div.pp-hover"
-            )
+            project_items = self._find_all('project_items', default=[])
             
             for project in project_items:
                 try:
                     # Extract title
-                    title = project.find_element(
-                        By.CSS_SELECTOR,
-                        "h4.mb-0.mt-0"
-                    ).text.strip()
+                    title = self._find('project_title', project).text.strip()
                     
                     # Extract price
-                    price_text = project.find_element(
-                        By.CSS_SELECTOR,
-                        "div.air3-token.product-price-start"
-                    ).text.strip()
+                    price_text = self._find('project_price', project).text.strip()
                     
                     # Parse "From $50" or "$50" or "$6,000"
                     is_from = price_text.startswith('From')
@@ -579,10 +1576,7 @@ class ProfileScraper:
                     amount = float(amount_str)
                     
                     # Extract delivery time
-                    delivery_text = project.find_element(
-                        By.CSS_SELECTOR,
-                        "div.delivery-days"
-                    ).text.strip()
+                    delivery_text = self._find('project_delivery', project).text.strip()
                     
                     # Parse "1 day delivery"
                     delivery_parts = delivery_text.split()
@@ -626,30 +1620,18 @@ class ProfileScraper:
         
         try:
             # Find all testimonial items
-            testimonial_items = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "section.testimonial-item"
-            )
+            testimonial_items = self._find_all('testimonial_items', default=[])
             
             for item in testimonial_items:
                 try:
                     # Extract testimonial text
-                    text = item.find_element(
-                        By.CSS_SELECTOR,
-                        "p.mb-6x"
-                    ).text.strip()
+                    text = self._find('testimonial_text', item).text.strip()
                     
                     # Extract author info
-                    author_info = item.find_element(
-                        By.CSS_SELECTOR,
-                        "p.text-base"
-                    )
+                    author_info = self._find('testimonial_author', item)
                     
                     # Get author name and position
-                    author_text = author_info.find_element(
-                        By.CSS_SELECTOR,
-                        "strong"
-                    ).text.strip()
+                    author_text = self._find('testimonial_author_name', author_info).text.strip()
                     
                     # Split "Alonso C. | CEO" into name and position
                     if '|' in author_text:
@@ -661,20 +1643,10 @@ class ProfileScraper:
                         author_position = None
                     
                     # Get date
-                    date = author_info.find_element(
-                        By.CSS_SELECTOR,
-                        "span.vertical-align-middle.pr-3x"
-                    ).text.strip()
+                    date = self._find('testimonial_date', author_info).text.strip()
                     
                     # Check if verified
-                    try:
-                        item.find_element(
-                            By.CSS_SELECTOR,
-                            "span.text-light-on-inverse"
-                        )
-                        verified = True
-                    except:
-                        verified = False
+                    verified = self._find('testimonial_verified', item, default=None) is not None
                     
                     testimonials.append({
                         'text': text,
@@ -0,0 +1,219 @@
+from pathlib import Path
+import json
+import threading
+import time
+import logging
+
+CSS_SELECTOR = "css selector"
+XPATH = "xpath"
+
+_MISSING = object()
+
+
+class SelectorChainMiss(LookupError):
+    """Raised when no selector of a chain produced a usable result."""
+
+
+def locator(selector):
+    """Returns the (By, selector) pair of a chain entry; entries starting with '//' are XPath."""
+    return (XPATH if selector.startswith('//') else CSS_SELECTOR, selector)
+
+
+class SelectorStats:
+    """Hit/miss/time counters of one selector, with decayed counts favouring recent results."""
+    # Weight kept by past results at each new observation
+    DECAY = 0.98
+
+    def __init__(self, hits=0, misses=0, seconds=0.0, recent_hits=0.0, recent_attempts=0.0):
+        self.hits = hits
+        self.misses = misses
+        self.seconds = seconds
+        self.recent_hits = recent_hits
+        self.recent_attempts = recent_attempts
+
+    def record(self, hit, seconds):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.seconds += seconds
+        self.recent_hits = self.recent_hits * self.DECAY + (1 if hit else 0)
+        self.recent_attempts = self.recent_attempts * self.DECAY + 1
+
+    @property
+    def score(self):
+        """Recent success rate, smoothed so unseen selectors start at 0.5."""
+        return (self.recent_hits + 1) / (self.recent_attempts + 2)
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class SelectorRegistry:
+    """
+    Named fallback chains of selectors shared by the extractors.
+    Records hits, misses and time per selector, tries each chain in order of
+    recent success rate, persists its statistics between runs and warns when
+    a chain that used to work stops matching.
+    """
+    # Consecutive misses of a usually-working chain before warning
+    FAILURE_STREAK = 10
+    # Lifetime hit rate above which a chain is considered usually working
+    RELIABLE_RATE = 0.5
+
+    def __init__(self, chains, path=None, optional=()):
+        """
+        Args:
+            chains (dict): Chain name -> list of selectors, in default order
+            path (str): Optional JSON file the statistics are loaded from and saved to
+            optional (iterable): Names of chains whose element is often absent by design,
+                never warned about when they miss
+        """
+        self.chains = chains
+        self.path = Path(path) if path else None
+        self.optional = frozenset(optional)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.chain_hits = {name: 0 for name in chains}
+        self.chain_attempts = {name: 0 for name in chains}
+        self.miss_streaks = {name: 0 for name in chains}
+        if self.path and self.path.exists():
+            self._load()
+
+    def ordered(self, name):
+        """Returns the selectors of a chain, best recent success rate first."""
+        with self.lock:
+            return sorted(
+                self.chains[name],
+                key=lambda selector: -self._stats(name, selector).score
+            )
+
+    def find(self, root, name, parse=None, default=_MISSING):
+        """
+        Returns the first element (or parse(element)) produced by the chain.
+
+        Args:
+            root: Driver, PageSnapshot or element to search from
+            name (str): Chain name
+            parse (callable): Optional conversion; raising or returning None counts as a miss
+            default: Returned when the whole chain misses, instead of raising
+
+        Raises:
+            SelectorChainMiss: No selector worked and no default was given
+        """
+        return self._run(name, default, lambda selector: self._apply(
+            parse, root.find_element(*locator(selector))
+        ))
+
+    def find_all(self, root, name, parse=None, default=_MISSING):
+        """
+        Returns the elements (or parse(elements)) of the first selector matching anything.
+        Same arguments as find.
+        """
+        def attempt(selector):
+            elements = root.find_elements(*locator(selector))
+            if not elements:
+                return None
+            return self._apply(parse, elements)
+        return self._run(name, default, attempt)
+
+    def save(self):
+        """Writes the statistics to the registry file, if any."""
+        if not self.path:
+            return
+        with self.lock:
+            data = {
+                'selectors': {
+                    name: {selector: stats.to_dict() for selector, stats in selectors.items()}
+                    for name, selectors in self.stats.items()
+                },
+                'chains': {
+                    name: {'hits': self.chain_hits[name], 'attempts': self.chain_attempts[name]}
+                    for name in self.chains
+                },
+            }
+        self.path.write_text(json.dumps(data, indent=2))
+
+    def report(self):
+        """Returns one line per selector with its hit rate and average time."""
+        lines = []
+        with self.lock:
+            for name in self.chains:
+                for selector in self.chains[name]:
+                    stats = self._stats(name, selector)
+                    attempts = stats.hits + stats.misses
+                    if not attempts:
+                        continue
+                    lines.append(
+                        f"{name}: {selector!r} {stats.hits}/{attempts} hits, "
+                        f"{stats.seconds / attempts * 1000:.2f} ms avg"
+                    )
+        return lines
+
+    def _run(self, name, default, attempt):
+        for selector in self.ordered(name):
+            started_at = time.perf_counter()
+            try:
+                result = attempt(selector)
+            except Exception:
+                result = None
+            self._record(name, selector, result is not None, time.perf_counter() - started_at)
+            if result is not None:
+                self._record_chain(name, True)
+                return result
+
+        self._record_chain(name, False)
+        if default is not _MISSING:
+            return default
+        raise SelectorChainMiss(f"No selector of chain '{name}' matched")
+
+    @staticmethod
+    def _apply(parse, value):
+        return parse(value) if parse else value
+
+    def _stats(self, name, selector):
+        return self.stats.setdefault(name, {}).setdefault(selector, SelectorStats())
+
+    def _record(self, name, selector, hit, seconds):
+        with self.lock:
+            self._stats(name, selector).record(hit, seconds)
+
+    def _record_chain(self, name, hit):
+        with self.lock:
+            reliable = (
+                self.chain_attempts[name]
+                and self.chain_hits[name] / self.chain_attempts[name] >= self.RELIABLE_RATE
+            )
+            self.chain_attempts[name] += 1
+            if hit:
+                self.chain_hits[name] += 1
+                self.miss_streaks[name] = 0
+                return
+            if name in self.optional:
+                # A miss only means the profile has no such element
+                return
+            self.miss_streaks[name] += 1
+            streak = self.miss_streaks[name]
+        if reliable and streak == self.FAILURE_STREAK:
+            logging.warning(
+                f"[SELECTORS] Chain '{name}' missed {streak} times in a row "
+                f"after working before, the page layout may have changed"
+            )
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable selector statistics {self.path}: {e}")
+            return
+        for name, selectors in data.get('selectors', {}).items():
+            if name not in self.chains:
+                continue
+            for selector, values in selectors.items():
+                # Selectors removed from the code are dropped with their statistics
+                if selector in self.chains[name]:
+                    self.stats.setdefault(name, {})[selector] = SelectorStats(**values)
+        for name, values in data.get('chains', {}).items():
+            if name in self.chains:
+                self.chain_hits[name] = values['hits']
+                self.chain_attempts[name] = values['attempts']
@@ -0,0 +1,269 @@
+import gzip
+import json
+import sqlite3
+import threading
+import time
+
+OUTPUT_FORMATS = ('json', 'ndjson', 'ndjson.gz', 'sqlite')
+
+
+class ProfileSink:
+    """
+    Base class for streaming profile writers.
+    Profiles are pushed one at a time as they finish, so memory stays flat
+    whatever the size of the crawl. Safe to call from the pool's threads.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.lock = threading.Lock()
+        self.file = self._open(path)
+
+    def write(self, profile_data):
+        with self.lock:
+            self._write(profile_data)
+            self.count += 1
+
+    def flush(self):
+        with self.lock:
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            self._close()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _open(self, path):
+        raise NotImplementedError
+
+    def _write(self, profile_data):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class JsonSink(ProfileSink):
+    """
+    Writes the historical result.json format (an indented JSON array),
+    streamed item by item instead of dumped at the end.
+    """
+    def _open(self, path):
+        f = open(path, 'w')
+        f.write('[')
+        return f
+
+    def _write(self, profile_data):
+        item = json.dumps(profile_data, indent=2).replace('\n', '\n  ')
+        self.file.write(('\n  ' if not self.count else ',\n  ') + item)
+
+    def _close(self):
+        self.file.write('\n]' if self.count else ']')
+
+
+class NdjsonSink(ProfileSink):
+    """Writes one JSON object per line, flushed as it goes so the file can be tailed."""
+    def _open(self, path):
+        return open(path, 'w', buffering=1)
+
+    def _write(self, profile_data):
+        self.file.write(json.dumps(profile_data) + '\n')
+
+
+class GzipNdjsonSink(NdjsonSink):
+    """Gzip-compressed NDJSON, flushed on page boundaries to keep compression effective."""
+    def _open(self, path):
+        return gzip.open(path, 'wt')
+
+
+class SqliteSink(ProfileSink):
+    """
+    Writes profiles into normalized SQLite tables (profiles, work_history, skills,
+    project_catalog, testimonials) for querying without loading a JSON dump.
+    Profiles are buffered and inserted in one transaction per page, or every
+    BATCH_SIZE profiles; a profile scraped again replaces its earlier rows.
+    Usable as a sink, or directly as on_page_complete through write_page.
+    """
+    # Profiles buffered at most before an intermediate commit
+    BATCH_SIZE = 500
+
+    SCHEMA = [
+        '''CREATE TABLE IF NOT EXISTS profiles (
+            profile_url TEXT PRIMARY KEY,
+            name TEXT, title TEXT, description TEXT,
+            job_success REAL, total_jobs INTEGER, total_hours INTEGER,
+            hourly_rate REAL, offer_title TEXT,
+            consultation_rate REAL, consultation_duration INTEGER, consultation_type TEXT,
+            hours_per_week TEXT, response_time TEXT, contract_to_hire INTEGER,
+            keywords TEXT, scraped_at REAL NOT NULL)''',
+        '''CREATE TABLE IF NOT EXISTS work_history (
+            profile_url TEXT NOT NULL REFERENCES profiles (profile_url), position INTEGER NOT NULL,
+            title TEXT, rating REAL, start_date TEXT, end_date TEXT, feedback TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS skills (
+            profile_url TEXT NOT NULL REFERENCES profiles (profile_url),
+            category TEXT, skill TEXT NOT NULL)''',
+        '''CREATE TABLE IF NOT EXISTS project_catalog (
+            profile_url TEXT NOT NULL REFERENCES profiles (profile_url), position INTEGER NOT NULL,
+            title TEXT, price REAL, price_type TEXT, delivery_duration INTEGER, delivery_unit TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS testimonials (
+            profile_url TEXT NOT NULL REFERENCES profiles (profile_url), position INTEGER NOT NULL,
+            text TEXT, author_name TEXT, author_position TEXT, date TEXT, verified INTEGER)''',
+        'CREATE INDEX IF NOT EXISTS profiles_job_success ON profiles (job_success)',
+        'CREATE INDEX IF NOT EXISTS profiles_hourly_rate ON profiles (hourly_rate)',
+        'CREATE INDEX IF NOT EXISTS work_history_profile_url ON work_history (profile_url)',
+        'CREATE INDEX IF NOT EXISTS skills_profile_url ON skills (profile_url)',
+        'CREATE INDEX IF NOT EXISTS skills_skill ON skills (skill)',
+        'CREATE INDEX IF NOT EXISTS project_catalog_profile_url ON project_catalog (profile_url)',
+        'CREATE INDEX IF NOT EXISTS testimonials_profile_url ON testimonials (profile_url)',
+    ]
+
+    CHILD_TABLES = ('work_history', 'skills', 'project_catalog', 'testimonials')
+
+    UPSERT_PROFILE = '''
+        INSERT INTO profiles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (profile_url) DO UPDATE SET
+            name = excluded.name, title = excluded.title, description = excluded.description,
+            job_success = excluded.job_success, total_jobs = excluded.total_jobs,
+            total_hours = excluded.total_hours, hourly_rate = excluded.hourly_rate,
+            offer_title = excluded.offer_title, consultation_rate = excluded.consultation_rate,
+            consultation_duration = excluded.consultation_duration,
+            consultation_type = excluded.consultation_type, hours_per_week = excluded.hours_per_week,
+            response_time = excluded.response_time, contract_to_hire = excluded.contract_to_hire,
+            keywords = excluded.keywords, scraped_at = excluded.scraped_at'''
+
+    def _open(self, path):
+        self.pending = []
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        for statement in self.SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return connection
+
+    def _write(self, profile_data):
+        self.pending.append(profile_data)
+        if len(self.pending) >= self.BATCH_SIZE:
+            self._insert_pending()
+
+    def write_page(self, page_results, page):
+        """on_page_complete callback: writes a page's profiles in one transaction."""
+        for profile_data in page_results:
+            self.write(profile_data)
+        self.flush()
+
+    def flush(self):
+        with self.lock:
+            self._insert_pending()
+
+    def _close(self):
+        self._insert_pending()
+
+    def _insert_pending(self):
+        if not self.pending:
+            return
+        profiles = self.pending
+        self.pending = []
+        urls = [(profile_data['profile_url'],) for profile_data in profiles]
+        with self.file:
+            # Re-scraped profiles replace their previous rows
+            for table in self.CHILD_TABLES:
+                self.file.executemany(f'DELETE FROM {table} WHERE profile_url = ?', urls)
+            self.file.executemany(self.UPSERT_PROFILE, [self._profile_row(p) for p in profiles])
+            self.file.executemany(
+                'INSERT INTO work_history VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (p['profile_url'], position, job.get('title'), job.get('rating'),
+                     (job.get('dates') or {}).get('start'), (job.get('dates') or {}).get('end'),
+                     job.get('feedback'))
+                    for p in profiles for position, job in enumerate(p.get('work_history') or [])
+                ]
+            )
+            self.file.executemany(
+                'INSERT INTO skills VALUES (?, ?, ?)',
+                [
+                    (p['profile_url'], category, skill)
+                    for p in profiles
+                    for category, skill in self._skill_rows(
+                        p.get('skills') or {'other_skills': (p.get('card') or {}).get('skills')}
+                    )
+                ]
+            )
+            self.file.executemany(
+                'INSERT INTO project_catalog VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (p['profile_url'], position, project.get('title'),
+                     (project.get('price') or {}).get('amount'), (project.get('price') or {}).get('type'),
+                     (project.get('delivery') or {}).get('duration'), (project.get('delivery') or {}).get('unit'))
+                    for p in profiles for position, project in enumerate(p.get('project_catalog') or [])
+                ]
+            )
+            self.file.executemany(
+                'INSERT INTO testimonials VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (p['profile_url'], position, testimonial.get('text'),
+                     (testimonial.get('author') or {}).get('name'),
+                     (testimonial.get('author') or {}).get('position'),
+                     testimonial.get('date'), testimonial.get('verified'))
+                    for p in profiles for position, testimonial in enumerate(p.get('testimonials') or [])
+                ]
+            )
+
+    @staticmethod
+    def _profile_row(profile_data):
+        # Shallow mode records only have their search card
+        card = profile_data.get('card') or {}
+        basic_info = profile_data.get('basic_info') or {
+            field: card.get(field) for field in ('name', 'title', 'job_success', 'total_jobs')
+        }
+        offer = profile_data.get('offer_details') or {'hourly_rate': card.get('hourly_rate')}
+        consultation = profile_data.get('consultation_rate') or {}
+        availability = profile_data.get('availability') or {}
+        keywords = profile_data.get('keywords')
+        return (
+            profile_data['profile_url'],
+            basic_info.get('name'), basic_info.get('title'), basic_info.get('description'),
+            basic_info.get('job_success'), basic_info.get('total_jobs'), basic_info.get('total_hours'),
+            offer.get('hourly_rate'), offer.get('title'),
+            consultation.get('rate'), consultation.get('duration'), consultation.get('type'),
+            availability.get('hours_per_week'), availability.get('response_time'),
+            availability.get('contract_to_hire'),
+            json.dumps(keywords) if keywords is not None else None,
+            time.time(),
+        )
+
+    @staticmethod
+    def _skill_rows(skills):
+        """Yields (category, skill), with a NULL category for uncategorized skills."""
+        for category, category_skills in (skills.get('categories') or {}).items():
+            for skill in category_skills:
+                yield category, skill
+        for skill in skills.get('other_skills') or []:
+            yield None, skill
+
+
+def open_sink(output_format, path):
+    """
+    Opens a sink for one of OUTPUT_FORMATS.
+
+    Args:
+        output_format (str): 'json', 'ndjson', 'ndjson.gz' or 'sqlite'
+        path (str): Output file
+
+    Returns:
+        ProfileSink: The opened sink
+    """
+    sinks = {
+        'json': JsonSink,
+        'ndjson': NdjsonSink,
+        'ndjson.gz': GzipNdjsonSink,
+        'sqlite': SqliteSink,
+    }
+    if output_format not in sinks:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return sinks[output_format](path)
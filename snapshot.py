@@ -0,0 +1,172 @@
+import re
+from lxml import etree, html as lxml_html
+
+
+# Locator strategies, same string values as selenium's `By` constants
+CSS_SELECTOR = "css selector"
+CLASS_NAME = "class name"
+XPATH = "xpath"
+
+
+class ElementNotFound(LookupError):
+    """Raised when a selector matches nothing in a snapshot (mirrors NoSuchElementException)."""
+
+
+_selector_cache = {}
+
+# Compound selector pieces: tag, #id, .class, [attr], [attr op 'value'], :first-child
+_CSS_TOKEN = re.compile(
+    r"""(?P<tag>^[\w*-]+)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\.(?P<cls>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:(?P<op>[\^*$]?=)['"]?(?P<value>[^'"\]]*)['"]?)?\]"""
+    r"""|(?P<first>:first-child)"""
+)
+
+
+def css_to_xpath(selector):
+    """
+    Translates the CSS subset used by the extractors (descendant combinators,
+    tags, ids, classes, attribute tests and :first-child) into XPath, so the
+    same selector strings work on the live driver and on lxml snapshots.
+    """
+    steps = []
+    for compound in selector.split():
+        tag = '*'
+        predicates = []
+        pos = 0
+        while pos < len(compound):
+            match = _CSS_TOKEN.match(compound, pos)
+            if not match or match.end() == pos:
+                raise ValueError(f"Unsupported CSS selector for snapshots: {selector!r}")
+            pos = match.end()
+            if match.group('tag'):
+                tag = match.group('tag')
+            elif match.group('id'):
+                predicates.append(f"@id='{match.group('id')}'")
+            elif match.group('cls'):
+                predicates.append(
+                    f"contains(concat(' ', normalize-space(@class), ' '), ' {match.group('cls')} ')"
+                )
+            elif match.group('attr'):
+                attr, op, value = match.group('attr', 'op', 'value')
+                if op is None:
+                    predicates.append(f"@{attr}")
+                elif op == '=':
+                    predicates.append(f"@{attr}='{value}'")
+                elif op == '^=':
+                    predicates.append(f"starts-with(@{attr}, '{value}')")
+                elif op == '*=':
+                    predicates.append(f"contains(@{attr}, '{value}')")
+                else:
+                    predicates.append(
+                        f"substring(@{attr}, string-length(@{attr}) - {len(value) - 1})='{value}'"
+                    )
+            else:
+                predicates.append("not(preceding-sibling::*)")
+        steps.append(tag + ''.join(f"[{p}]" for p in predicates))
+    return 'descendant::' + '/descendant::'.join(steps) if steps else '.'
+
+
+def _compile(by, selector):
+    """Compiles a (By, selector) pair into an lxml callable, memoized per pair."""
+    key = (by, selector)
+    compiled = _selector_cache.get(key)
+    if compiled is None:
+        if by == CSS_SELECTOR:
+            compiled = etree.XPath(css_to_xpath(selector))
+        elif by == CLASS_NAME:
+            compiled = etree.XPath(css_to_xpath(f".{selector}"))
+        elif by == XPATH:
+            compiled = etree.XPath(selector)
+        else:
+            raise ValueError(f"Unsupported locator strategy for snapshots: {by}")
+        _selector_cache[key] = compiled
+    return compiled
+
+
+# Elements a browser never renders, whose text Selenium reports as ''
+_UNRENDERED_TAGS = frozenset({'head', 'script', 'style', 'noscript', 'template'})
+_DISPLAY_NONE = re.compile(r'display\s*:\s*none', re.IGNORECASE)
+
+
+def _is_hidden(node):
+    """Checks whether a node is not displayed by itself: unrendered tag, hidden attribute or inline display:none."""
+    return (
+        node.tag in _UNRENDERED_TAGS
+        or node.get('hidden') is not None
+        or bool(_DISPLAY_NONE.search(node.get('style') or ''))
+    )
+
+
+def _collect_text(node, parts):
+    if node.text:
+        parts.append(node.text)
+    for child in node:
+        # Comments and processing instructions have a non-string tag; only their tail is text
+        if isinstance(child.tag, str) and not _is_hidden(child):
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _visible_text(node):
+    """
+    Approximates Selenium's rendered `.text` for an lxml node: empty for a node
+    that is not displayed, skips hidden descendants, collapses runs of whitespace
+    inside each line and drops blank lines.
+    """
+    if any(_is_hidden(ancestor) for ancestor in (node, *node.iterancestors())):
+        return ''
+    parts = []
+    _collect_text(node, parts)
+    lines = (' '.join(line.split()) for line in ''.join(parts).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+class SnapshotElement:
+    """
+    Read-only element wrapper exposing the subset of the WebElement API
+    used by the extractors (find_element(s), text, get_attribute).
+    """
+    __slots__ = ('_node', '_text')
+
+    def __init__(self, node):
+        self._node = node
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = _visible_text(self._node)
+        return self._text
+
+    def get_attribute(self, name):
+        return self._node.get(name)
+
+    def find_elements(self, by, selector):
+        return [SnapshotElement(node) for node in _compile(by, selector)(self._node)
+                if not isinstance(node, str)]
+
+    def find_element(self, by, selector):
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise ElementNotFound(f"No element matches {by}={selector!r}")
+        return elements[0]
+
+
+class PageSnapshot(SnapshotElement):
+    """
+    Offline copy of a rendered page, parsed once from `driver.page_source`.
+    Quacks like the driver for lookups, so the extractors run against it
+    without any chromedriver round trips.
+    """
+    __slots__ = ()
+
+    def __init__(self, page_source):
+        super().__init__(lxml_html.fromstring(page_source))
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Takes a single page_source snapshot of the driver's current page."""
+        return cls(driver.page_source)
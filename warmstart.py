@@ -0,0 +1,156 @@
+from pathlib import Path
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: profiles are not locked
+    fcntl = None
+
+
+def chrome_major_version(binary):
+    """
+    Reads the major version of a Chrome binary from `chrome --version`.
+
+    Returns:
+        int: The major version, or None if it could not be determined
+    """
+    if not binary:
+        return None
+    try:
+        output = subprocess.run(
+            [binary, '--version'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logging.debug(f"Could not read the Chrome version of {binary}: {e}")
+        return None
+    match = re.search(r'(\d+)\.\d+\.\d+', output)
+    return int(match.group(1)) if match else None
+
+
+class WarmStart:
+    """
+    Starts Chrome drivers without paying the cold start every time: the
+    chromedriver patched by undetected_chromedriver is cached per Chrome major
+    version, and each browser reuses a persistent user-data-dir so cookies and
+    the HTTP disk cache survive restarts. A profile is locked by the process
+    using it, so concurrent runs on one machine take numbered siblings instead
+    of a profile Chrome would refuse to open twice.
+    """
+    # Numbered siblings tried per profile name before a temporary profile is used
+    MAX_PROFILE_SLOTS = 16
+
+    def __init__(self, cache_dir, chrome_path=None):
+        """
+        Args:
+            cache_dir (str): Directory holding the cached drivers and browser profiles
+            chrome_path (str): Optional Chrome binary, found automatically otherwise
+        """
+        self.driver_dir = Path(cache_dir) / 'drivers'
+        self.profiles_dir = Path(cache_dir) / 'profiles'
+        self.chrome_path = chrome_path
+        self.version = None
+        self.lock = threading.Lock()
+        # Profile name -> directory claimed by this process, kept across browser restarts
+        self.claimed_profiles = {}
+        # Open lock files, whose locks are held until the process exits
+        self.lock_files = []
+
+    def chrome_version(self):
+        """Returns the installed Chrome's major version, read once."""
+        import undetected_chromedriver as uc
+        
+        with self.lock:
+            if self.version is None:
+                self.version = chrome_major_version(self.chrome_path or uc.find_chrome_executable()) or 0
+            return self.version or None
+
+    def driver_path(self, version):
+        """Returns the cache location of the patched chromedriver for a Chrome major version."""
+        suffix = '.exe' if sys.platform.startswith('win') else ''
+        return self.driver_dir / f"chromedriver-{version}{suffix}"
+
+    def create_driver(self, options, profile_name):
+        """
+        Starts Chrome on a persistent profile, with the cached patched driver if there is one.
+        On a cache miss the driver is downloaded and patched as usual, then cached.
+
+        Args:
+            options: Fresh uc.ChromeOptions
+            profile_name (str): Name of the user-data-dir; concurrent browsers of a run need
+                distinct names, other runs using the name get a numbered sibling
+
+        Returns:
+            tuple: (driver, warm) where warm tells whether the cached driver was used
+        """
+        import undetected_chromedriver as uc
+        
+        version = self.chrome_version()
+        profile_dir = self.claim_profile(profile_name)
+        kwargs = {'options': options, 'user_data_dir': str(profile_dir)}
+        if version:
+            kwargs['version_main'] = version
+
+        cached_driver = self.driver_path(version) if version else None
+        warm = bool(cached_driver and cached_driver.exists())
+        if warm:
+            kwargs['driver_executable_path'] = str(cached_driver)
+
+        driver = uc.Chrome(**kwargs)
+
+        if cached_driver and not warm:
+            self._store_driver(driver.patcher.executable_path, cached_driver)
+        return driver, warm
+
+    def claim_profile(self, profile_name):
+        """
+        Returns the profile directory of a browser name, locked for this process.
+        A name already in use by another process moves on to name-2, name-3, ...,
+        and to a temporary profile when all of them are busy.
+        """
+        with self.lock:
+            if profile_name in self.claimed_profiles:
+                return self.claimed_profiles[profile_name]
+            self.profiles_dir.mkdir(parents=True, exist_ok=True)
+            for slot in range(1, self.MAX_PROFILE_SLOTS + 1):
+                profile_dir = self.profiles_dir / (profile_name if slot == 1 else f"{profile_name}-{slot}")
+                if self._lock_profile(profile_dir):
+                    if slot > 1:
+                        logging.info(f"[INFO] Profile '{profile_name}' is used by another run, using {profile_dir}")
+                    break
+            else:
+                profile_dir = Path(tempfile.mkdtemp(prefix=f"chrome-{profile_name}-"))
+                logging.warning(f"Every persistent profile '{profile_name}' is in use, starting from {profile_dir}")
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            self.claimed_profiles[profile_name] = profile_dir
+            return profile_dir
+
+    def _lock_profile(self, profile_dir):
+        """Takes the lock of a profile directory without waiting; False if another process holds it."""
+        if fcntl is None:
+            return True
+        lock_file = open(f"{profile_dir}.lock", 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self.lock_files.append(lock_file)
+        return True
+
+    def _store_driver(self, patched_path, cached_driver):
+        """Copies a freshly patched driver into the cache, atomically since several runs may share the cache."""
+        try:
+            self.driver_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cached_driver.with_name(f"{cached_driver.name}.{os.getpid()}.tmp")
+            shutil.copy2(patched_path, tmp_path)
+            os.replace(tmp_path, cached_driver)
+            logging.info(f"[INFO] Cached patched chromedriver at {cached_driver}")
+        except OSError as e:
+            logging.warning(f"Could not cache the patched chromedriver: {e}")
@@ -0,0 +1,189 @@
+from pathlib import Path
+import os
+import signal
+import threading
+import logging
+
+# Navigations between two measurements of the browser's memory
+RSS_CHECK_INTERVAL = 10
+
+# Seconds past the page load timeout before a stuck navigation is killed
+KILL_GRACE = 15
+
+
+def process_tree_rss_mb(pids):
+    """
+    Sums the resident memory of processes and all their descendants, from /proc.
+
+    Args:
+        pids (list[int]): Roots of the process trees, e.g. Chrome and chromedriver
+
+    Returns:
+        float: Resident memory in MB, or None where /proc is not available
+    """
+    proc = Path('/proc')
+    pids = [pid for pid in pids if pid]
+    if not pids or not proc.is_dir():
+        return None
+
+    children = {}
+    rss_kb = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            status = (entry / 'status').read_text()
+        except OSError:
+            continue
+        fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+        children.setdefault(int(fields.get('PPid', '0').strip()), []).append(int(entry.name))
+        rss_kb[int(entry.name)] = int(fields.get('VmRSS', '0 kB').split()[0])
+
+    total_kb = 0
+    seen = set()
+    stack = list(pids)
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        total_kb += rss_kb.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+def report_result(driver, ok):
+    """Tells a ManagedDriver whether a page could be scraped; no-op for plain drivers."""
+    if isinstance(driver, ManagedDriver):
+        driver.report(ok)
+
+
+class ManagedDriver:
+    """
+    Chrome driver wrapper that recycles the browser before it degrades on long
+    crawls: after driver_max_navigations page loads, when the browser's process
+    tree grows past driver_max_rss_mb, or after driver_max_failures pages in a
+    row failed. Recycling happens at the start of a navigation, so no page is
+    lost mid-extraction, and a navigation that killed the browser is retried
+    once on a fresh one. Each navigation has a hard deadline, after which the
+    browser is killed instead of blocking the run.
+    Everything else is forwarded to the current driver, so scrapers, fetchers
+    and captures holding this object follow the recycles transparently.
+    """
+    def __init__(self, create_driver, config, metrics, name='main'):
+        """
+        Args:
+            create_driver (callable): Starts a fresh driver
+            config: ScraperConfig instance
+            metrics (Metrics): Stage timers and counters of the run
+            name (str): Browser name, used in logs
+        """
+        self._create_driver = create_driver
+        self._config = config
+        self._metrics = metrics
+        self._name = name
+        self._lock = threading.Lock()
+        self._driver = None
+        self._start()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._driver, name)
+
+    def get(self, url):
+        """Navigates to a URL, recycling the browser first or after if it needs to."""
+        reason = self._recycle_reason()
+        if reason:
+            self.recycle(reason)
+
+        try:
+            self._navigate(url)
+        except Exception:
+            if self._is_alive():
+                raise
+            self.recycle('the browser died')
+            logging.info(f"[WATCHDOG] Resuming {url} on the fresh browser")
+            self._navigate(url)
+
+    def report(self, ok):
+        """Records whether the current page could be scraped, for the consecutive failure count."""
+        with self._lock:
+            self._failures = 0 if ok else self._failures + 1
+
+    def recycle(self, reason):
+        """Quits the browser and starts a fresh one."""
+        logging.warning(f"[WATCHDOG] Recycling Chrome '{self._name}' after {self._navigations} navigations: {reason}")
+        self._metrics.increment('driver_recycles')
+        self._quit()
+        self._start()
+
+    def quit(self):
+        self._quit()
+
+    def _start(self):
+        self._driver = self._create_driver()
+        # Bounds a slow page load; the kill timer in _navigate bounds a hung driver
+        self._driver.set_page_load_timeout(self._config.navigation_deadline)
+        self._navigations = 0
+        self._failures = 0
+
+    def _quit(self):
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            self._kill()
+        self._driver = None
+
+    def _navigate(self, url):
+        timer = threading.Timer(self._config.navigation_deadline + KILL_GRACE, self._on_deadline, args=(url,))
+        timer.daemon = True
+        timer.start()
+        try:
+            self._driver.get(url)
+        finally:
+            timer.cancel()
+            self._navigations += 1
+
+    def _on_deadline(self, url):
+        logging.error(f"[WATCHDOG] Navigation to {url} is stuck, killing Chrome '{self._name}'")
+        self._metrics.increment('navigation_kills')
+        self._kill()
+
+    def _pids(self):
+        """Process ids of the browser (started detached by undetected_chromedriver) and chromedriver."""
+        service = getattr(self._driver, 'service', None)
+        return [
+            getattr(self._driver, 'browser_pid', None),
+            getattr(getattr(service, 'process', None), 'pid', None),
+        ]
+
+    def _kill(self):
+        """Kills the browser and chromedriver processes, unblocking any pending command."""
+        for pid in self._pids():
+            if pid:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+
+    def _is_alive(self):
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _recycle_reason(self):
+        config = self._config
+        if config.driver_max_failures and self._failures >= config.driver_max_failures:
+            return f"{self._failures} failed pages in a row"
+        if config.driver_max_navigations and self._navigations >= config.driver_max_navigations:
+            return f"navigation limit of {config.driver_max_navigations} reached"
+        if config.driver_max_rss_mb and self._navigations and self._navigations % RSS_CHECK_INTERVAL == 0:
+            rss_mb = process_tree_rss_mb(self._pids())
+            if rss_mb is not None and rss_mb > config.driver_max_rss_mb:
+                return f"{rss_mb:.0f} MB resident, over {config.driver_max_rss_mb} MB"
+        return None
@@ -0,0 +1,374 @@
+from contextlib import contextmanager
+import json
+import sqlite3
+import threading
+import time
+import logging
+from cache import canonical_profile_url
+
+try:
+    import fcntl
+except ImportError:  # Windows: SQLite's own locking only
+    fcntl = None
+
+PAGE = 'page'
+PROFILE = 'profile'
+
+
+class Task:
+    """One unit of work leased to a worker: a search page of a keyword, or a profile URL."""
+    def __init__(self, task_id, kind, keyword, page=None, url=None, data=None, attempts=0):
+        self.id = task_id
+        self.kind = kind
+        self.keyword = keyword
+        self.page = page
+        self.url = url
+        # Search card and fingerprint seen by the page's worker, for profile tasks
+        self.data = data or {}
+        self.attempts = attempts
+        # Lease state, only tracked on the tasks of a MemoryWorkQueue
+        self.status = 'pending'
+        self.worker = None
+        self.lease_expires = None
+        self.error = None
+
+    def __repr__(self):
+        return f"Task({self.kind} {self.keyword!r} {self.page if self.kind == PAGE else self.url})"
+
+
+class WorkQueue:
+    """
+    Queue of (keyword, page) and profile tasks shared by scraper workers.
+    A claimed task is leased to its worker, which keeps the lease alive with
+    heartbeats; tasks of a worker that stops heartbeating go back to the queue
+    once their lease expires, up to max_attempts claims. Profile URLs are
+    deduplicated globally, across keywords and workers.
+    """
+    def __init__(self, lease_seconds=300, max_attempts=3):
+        """
+        Args:
+            lease_seconds (float): How long a claimed task stays reserved without a heartbeat
+            max_attempts (int): Claims of a task before it is marked failed
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def add_pages(self, keyword, pages):
+        """
+        Queues search pages of a keyword; pages already queued are ignored.
+
+        Returns:
+            int: Number of pages added
+        """
+        raise NotImplementedError
+
+    def add_profiles(self, keyword, profile_urls, data=None):
+        """
+        Queues the profiles no worker has queued before.
+
+        Args:
+            keyword (str): Keyword the profiles were found under
+            profile_urls (list[str]): Profile URLs of a search page
+            data (dict): Optional profile URL -> data handed to the worker scraping it
+
+        Returns:
+            list[str]: The URLs added, in order
+        """
+        raise NotImplementedError
+
+    def claim(self, worker_id):
+        """
+        Leases the next task, profiles before pages so results keep flowing.
+
+        Returns:
+            Task: The leased task, or None when nothing is pending
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, worker_id):
+        """Extends the leases of the worker's tasks."""
+        raise NotImplementedError
+
+    def complete(self, task, worker_id):
+        """
+        Marks a task done.
+
+        Returns:
+            bool: False if the lease had expired and the task was handed to another worker
+        """
+        raise NotImplementedError
+
+    def fail(self, task, worker_id, error):
+        """Returns a failed task to the queue, or marks it failed after max_attempts claims."""
+        raise NotImplementedError
+
+    def skip_pages(self, keyword, after_page):
+        """Drops the pending pages of a keyword past its last page with results."""
+        raise NotImplementedError
+
+    def counts(self):
+        """
+        Returns:
+            dict: Number of tasks per status (pending, leased, done, failed, skipped)
+        """
+        raise NotImplementedError
+
+    def is_drained(self):
+        """Checks whether no task is pending or leased anymore."""
+        counts = self.counts()
+        return not counts.get('pending') and not counts.get('leased')
+
+    def summary(self):
+        counts = self.counts()
+        return "Work queue: " + ", ".join(f"{counts.get(status, 0)} {status}" for status in
+                                          ('pending', 'leased', 'done', 'failed', 'skipped'))
+
+    def close(self):
+        pass
+
+
+class MemoryWorkQueue(WorkQueue):
+    """In-process WorkQueue with the same semantics, for tests and single-machine trials."""
+    def __init__(self, lease_seconds=300, max_attempts=3):
+        super().__init__(lease_seconds, max_attempts)
+        self.lock = threading.Lock()
+        self.tasks = []
+        self.keys = set()
+        self.seen = set()
+
+    def add_pages(self, keyword, pages):
+        with self.lock:
+            added = 0
+            for page in pages:
+                if (PAGE, keyword, page) not in self.keys:
+                    self.keys.add((PAGE, keyword, page))
+                    self.tasks.append(Task(len(self.tasks), PAGE, keyword, page=page))
+                    added += 1
+            return added
+
+    def add_profiles(self, keyword, profile_urls, data=None):
+        with self.lock:
+            added = []
+            for profile_url in profile_urls:
+                canonical_url = canonical_profile_url(profile_url)
+                if canonical_url not in self.seen:
+                    self.seen.add(canonical_url)
+                    self.tasks.append(Task(len(self.tasks), PROFILE, keyword, url=profile_url,
+                                           data=(data or {}).get(profile_url)))
+                    added.append(profile_url)
+            return added
+
+    def claim(self, worker_id):
+        with self.lock:
+            now = time.time()
+            self._expire_leases(now)
+            pending = [task for task in self.tasks if task.status == 'pending']
+            if not pending:
+                return None
+            task = min(pending, key=lambda task: (task.kind != PROFILE, task.id))
+            task.status, task.worker, task.lease_expires = 'leased', worker_id, now + self.lease_seconds
+            task.attempts += 1
+            return task
+
+    def heartbeat(self, worker_id):
+        with self.lock:
+            for task in self.tasks:
+                if task.status == 'leased' and task.worker == worker_id:
+                    task.lease_expires = time.time() + self.lease_seconds
+
+    def complete(self, task, worker_id):
+        with self.lock:
+            if task.status != 'leased' or task.worker != worker_id:
+                return False
+            task.status = 'done'
+            return True
+
+    def fail(self, task, worker_id, error):
+        with self.lock:
+            if task.status == 'leased' and task.worker == worker_id:
+                task.error = error
+                task.status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+
+    def skip_pages(self, keyword, after_page):
+        with self.lock:
+            for task in self.tasks:
+                if task.kind == PAGE and task.keyword == keyword and task.page > after_page \
+                        and task.status == 'pending':
+                    task.status = 'skipped'
+
+    def counts(self):
+        with self.lock:
+            counts = {}
+            for task in self.tasks:
+                counts[task.status] = counts.get(task.status, 0) + 1
+            return counts
+
+    def _expire_leases(self, now):
+        for task in self.tasks:
+            if task.status == 'leased' and task.lease_expires < now:
+                logging.warning(f"[QUEUE] Lease of {task} held by {task.worker} expired")
+                task.status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    WorkQueue in a SQLite file, for workers on several machines sharing a volume.
+    Every operation is one transaction taken under an exclusive lock on a
+    sibling .lock file, since SQLite's own locking is unreliable on network
+    file systems; the rollback journal is used because WAL needs shared memory.
+    """
+    def __init__(self, path, lease_seconds=300, max_attempts=3):
+        """
+        Args:
+            path (str): SQLite database file on the shared volume
+            Other arguments as in WorkQueue
+        """
+        super().__init__(lease_seconds, max_attempts)
+        self.lock_path = f"{path}.lock"
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=DELETE')
+        with self._transaction() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS tasks ('
+                'id INTEGER PRIMARY KEY, kind TEXT NOT NULL, keyword TEXT NOT NULL, '
+                "page INTEGER NOT NULL DEFAULT 0, url TEXT NOT NULL DEFAULT '', data TEXT, "
+                "status TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_expires REAL, "
+                'attempts INTEGER NOT NULL DEFAULT 0, error TEXT, UNIQUE (kind, keyword, page, url))'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, kind, id)')
+            db.execute('CREATE TABLE IF NOT EXISTS seen_profiles (url TEXT PRIMARY KEY)')
+
+    @contextmanager
+    def _transaction(self):
+        with self.lock, open(self.lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def add_pages(self, keyword, pages):
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                'INSERT OR IGNORE INTO tasks (kind, keyword, page) VALUES (?, ?, ?)',
+                [(PAGE, keyword, page) for page in pages]
+            )
+            return db.total_changes - before
+
+    def add_profiles(self, keyword, profile_urls, data=None):
+        added = []
+        with self._transaction() as db:
+            for profile_url in profile_urls:
+                inserted = db.execute(
+                    'INSERT OR IGNORE INTO seen_profiles (url) VALUES (?)', (canonical_profile_url(profile_url),)
+                ).rowcount
+                if not inserted:
+                    continue
+                profile_data = (data or {}).get(profile_url)
+                db.execute(
+                    'INSERT OR IGNORE INTO tasks (kind, keyword, url, data) VALUES (?, ?, ?, ?)',
+                    (PROFILE, keyword, profile_url, json.dumps(profile_data) if profile_data else None)
+                )
+                added.append(profile_url)
+        return added
+
+    def claim(self, worker_id):
+        now = time.time()
+        with self._transaction() as db:
+            for task_id, worker, attempts in db.execute(
+                "SELECT id, worker, attempts FROM tasks WHERE status = 'leased' AND lease_expires < ?", (now,)
+            ).fetchall():
+                logging.warning(f"[QUEUE] Lease of task {task_id} held by {worker} expired")
+                db.execute(
+                    'UPDATE tasks SET status = ? WHERE id = ?',
+                    ('failed' if attempts >= self.max_attempts else 'pending', task_id)
+                )
+            row = db.execute(
+                "SELECT id, kind, keyword, page, url, data, attempts FROM tasks WHERE status = 'pending' "
+                "ORDER BY kind = 'profile' DESC, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                'WHERE id = ?',
+                (worker_id, now + self.lease_seconds, row[0])
+            )
+        task_id, kind, keyword, page, url, data, attempts = row
+        return Task(task_id, kind, keyword, page if kind == PAGE else None, url or None,
+                    json.loads(data) if data else None, attempts + 1)
+
+    def heartbeat(self, worker_id):
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE status = 'leased' AND worker = ?",
+                (time.time() + self.lease_seconds, worker_id)
+            )
+
+    def complete(self, task, worker_id):
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE tasks SET status = 'done' WHERE id = ? AND status = 'leased' AND worker = ?",
+                (task.id, worker_id)
+            ).rowcount == 1
+
+    def fail(self, task, worker_id, error):
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ? "
+                "WHERE id = ? AND status = 'leased' AND worker = ?",
+                (self.max_attempts, error, task.id, worker_id)
+            )
+
+    def skip_pages(self, keyword, after_page):
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE tasks SET status = 'skipped' WHERE kind = ? AND keyword = ? AND page > ? AND status = 'pending'",
+                (PAGE, keyword, after_page)
+            )
+
+    def counts(self):
+        with self._transaction() as db:
+            return dict(db.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status').fetchall())
+
+    def close(self):
+        self.connection.close()
+
+
+class Heartbeat:
+    """Background thread renewing a worker's leases every interval seconds."""
+    def __init__(self, queue, worker_id, interval):
+        """
+        Args:
+            queue (WorkQueue): Queue holding the leases
+            worker_id (str): Worker whose leases are renewed
+            interval (float): Seconds between heartbeats, well under the lease duration
+        """
+        self.queue = queue
+        self.worker_id = worker_id
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name='queue-heartbeat', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread:
+            self.stopped.set()
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.queue.heartbeat(self.worker_id)
+            except Exception as e:
+                logging.warning(f"[QUEUE] Heartbeat of {self.worker_id} failed: {e}")